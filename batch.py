@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Generate comparison outputs for many markdown documents in one process
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+from build_manifest import BuildManifest, hash_bytes, hash_file
+from generate_excel import hash_markdown_tables, read_comparison_tables
+from generate_pdf import reportlab_available
+from pipeline import emit_table, generators_hash, report_outputs
+from profiling import PROFILER, add_profile_argument, report_profile
+from references import ReferenceIndex
+from task_pool import default_jobs, run_tasks
+
+def read_input_list(filename):
+    """Return the paths and glob patterns listed in a manifest file.
+    
+    One entry per line; blank lines and lines starting with '#' are ignored.
+    """
+    patterns = []
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                patterns.append(line)
+    return patterns
+
+def expand_inputs(patterns):
+    """Expand glob patterns ('**' included) into a sorted, de-duplicated list of files"""
+    files = {}
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            if Path(match).is_file():
+                files.setdefault(os.path.normpath(match), None)
+            elif not glob.has_magic(pattern):
+                print(f"File not found: {match}")
+    return sorted(files)
+
+def output_prefixes(files, output_dir):
+    """Map each document to the path prefix of its outputs.
+    
+    The directory layout of the inputs below their common parent is
+    mirrored under output_dir, with one folder per document, so documents
+    with the same name in different folders never collide.
+    """
+    if not files:
+        return {}
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in files])
+    prefixes = {}
+    for filename in files:
+        relative = Path(os.path.relpath(os.path.abspath(filename), root))
+        prefixes[filename] = str(Path(output_dir) / relative.parent / relative.stem / relative.stem)
+    return prefixes
+
+def document_title(filename):
+    """Return a readable title from a markdown file name"""
+    return Path(filename).stem.replace('_', ' ').replace('-', ' ').title()
+
+def process_document(markdown_file, prefix, with_pdf, quiet=False):
+    """Write every output of one markdown document and return its statistics.
+    
+    The document's output folder is only created once it has a table to write.
+    """
+    title = document_title(markdown_file)
+    references = ReferenceIndex()
+    hash_markdown_tables(markdown_file, references)
+    
+    stats = {'tables': 0, 'rows': 0, 'outputs': []}
+    with contextlib.redirect_stdout(io.StringIO() if quiet else sys.stdout):
+        for i, table in enumerate(read_comparison_tables(markdown_file)):
+            if not table:
+                continue
+            number = i + 1
+            stem = f"{prefix}_table_{number}"
+            if not stats['tables']:
+                Path(prefix).parent.mkdir(parents=True, exist_ok=True)
+            emit_table(table, prefix, number, stem, f"{title} - Table {number}", with_pdf, references)
+            stats['tables'] += 1
+            stats['rows'] += len(table)
+            stats['outputs'].extend(report_outputs(prefix, number, stem, with_pdf))
+    return stats
+
+def print_throughput(documents, skipped, results, input_bytes, elapsed):
+    """Print aggregate counts and rates for a batch run"""
+    tables = sum(r['tables'] for r in results)
+    rows = sum(r['rows'] for r in results)
+    output_bytes = sum(Path(o).stat().st_size for r in results for o in r['outputs'] if Path(o).exists())
+    elapsed = max(elapsed, 1e-9)
+    print(f"\nProcessed {documents} documents ({skipped} up to date): {tables} tables, {rows} rows")
+    print(f"Read {input_bytes / 1e6:.2f} MB, wrote {output_bytes / 1e6:.2f} MB in {elapsed:.2f}s")
+    print(f"Throughput: {(documents - skipped) / elapsed:.1f} documents/s, {rows / elapsed:.0f} rows/s, "
+          f"{input_bytes / 1e6 / elapsed:.2f} MB/s")
+
+def main(patterns, output_dir='output', jobs=1, force=False, with_pdf=True, quiet=False):
+    if with_pdf and not reportlab_available():
+        print("reportlab is not installed; skipping PDF output")
+        with_pdf = False
+    
+    files = expand_inputs(patterns)
+    if not files:
+        print("No markdown documents matched")
+        return 0
+    prefixes = output_prefixes(files, output_dir)
+    
+    start = time.perf_counter()
+    manifest = BuildManifest()
+    script_hash = hash_bytes((generators_hash() + str(hash_file(__file__))).encode())
+    
+    # Skip documents whose source and recorded outputs are unchanged; a document
+    # without tables has an entry with no outputs, which counts as up to date
+    tasks = []
+    skipped = 0
+    for filename in files:
+        key = f"batch:{filename}"
+        inputs = {'script': script_hash, 'source': hash_file(filename), 'prefix': prefixes[filename], 'pdf': with_pdf}
+        entry = manifest.entries.get(key)
+        if not force and entry is not None and manifest.is_up_to_date(key, inputs, list(entry.get('outputs', {}))):
+            skipped += 1
+            continue
+        tasks.append((key, inputs, filename))
+    
+    # Process the documents with at most jobs running at once
+    results = []
+    errors = run_tasks(
+        [(process_document, (filename, prefixes[filename], with_pdf, quiet)) for _, _, filename in tasks],
+        jobs,
+        results
+    )
+    failures = 0
+    for (key, inputs, filename), error, result in zip(tasks, errors, results):
+        if error:
+            failures += 1
+            print(f"Failed: {filename}: {error}")
+        else:
+            manifest.record(key, inputs, result['outputs'])
+    manifest.save()
+    
+    input_bytes = sum(Path(filename).stat().st_size for _, _, filename in tasks)
+    print_throughput(len(files), skipped, [r for r in results if r], input_bytes, time.perf_counter() - start)
+    return failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('inputs', nargs='*', help="markdown files or glob patterns, e.g. 'regions/**/*.md'")
+    parser.add_argument('--manifest', metavar='FILE', help='file listing more inputs, one path or pattern per line')
+    parser.add_argument('--output-dir', '-o', default='output', help='root directory of the generated files')
+    parser.add_argument('--jobs', '-j', type=int, default=0, metavar='N',
+                        help='process up to N documents in parallel (0 = one per CPU)')
+    parser.add_argument('--force', action='store_true', help='rebuild every document even if unchanged')
+    parser.add_argument('--no-pdf', action='store_true', help='skip ReportLab PDF output')
+    parser.add_argument('--quiet', '-q', action='store_true', help='only print failures and the final report')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    patterns = list(args.inputs)
+    if args.manifest:
+        patterns += read_input_list(args.manifest)
+    if not patterns:
+        parser.error('give at least one input or --manifest')
+    if args.profile:
+        PROFILER.enable()
+    jobs = args.jobs if args.jobs > 0 else default_jobs()
+    failures = main(patterns, args.output_dir, jobs, args.force, not args.no_pdf, args.quiet)
+    report_profile(args.profile)
+    if failures:
+        raise SystemExit(1)
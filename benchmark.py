@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark every generator stage on synthetic comparison documents
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from create_excel_like import create_formatted_csv_from_data
+from generate_excel import create_csv_from_table, create_json_from_table, read_comparison_tables
+from generate_pdf import create_pdf_from_data, reportlab_available
+from generate_simple_pdf import create_html_from_data
+
+BASE_PLATFORMS = [
+    'Jitsi Meet', 'Google Meet', 'Zoom', 'Microsoft Teams', 'Cisco Webex',
+    'Discord', 'Slack', 'BlueJeans', 'RingCentral', '8x8', 'Whereby', 'Loom'
+]
+QUALIFIERS = ['Host control', 'Moderator option', 'Paid plans', 'Enterprise only', 'Beta']
+TECHNICAL_VALUES = ['Adaptive WebRTC', 'TLS + SRTP', 'H.264/Opus', 'REST API', 'AWS', 'SAML/OAuth2']
+
+def synthetic_platforms(count):
+    """Return count platform names, extending the real list with numbered ones"""
+    names = BASE_PLATFORMS[:count]
+    names += [f"Platform {i}" for i in range(len(names) + 1, count + 1)]
+    return names
+
+def synthetic_cell(rng, references, technical):
+    """Return one cell in the style of the real comparison tables"""
+    if technical:
+        cell = rng.choice(TECHNICAL_VALUES)
+    else:
+        roll = rng.random()
+        if roll < 0.55:
+            cell = '✅'
+        elif roll < 0.85:
+            cell = '❌'
+        else:
+            cell = f"✅ ({rng.choice(QUALIFIERS)})"
+    if references and rng.random() < 0.1:
+        n = rng.randint(1, references)
+        cell += f" ([Source {n}][{n}])"
+    return cell
+
+def write_synthetic_markdown(filename, features, platforms, references, seed=0):
+    """Write a markdown document shaped like video_platform_comparison.md"""
+    rng = random.Random(seed)
+    names = synthetic_platforms(platforms)
+    headers = ['Category', 'Ser', 'Topic Name'] + names + ['Rmk / Explanation of Feature']
+    technical_count = max(1, features // 6)
+    sections = [
+        ('Technical Settings Comparison', 'Technical Setting', technical_count, True),
+        ('UI/UX Features Comparison', 'UI/UX Features', features - technical_count, False)
+    ]
+    
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write("# Synthetic Video Calling Platform Comparison\n\n")
+        for heading, category, count, technical in sections:
+            f.write(f"## {heading}\n\n")
+            f.write('| ' + ' | '.join(headers) + ' |\n')
+            f.write('| ' + ' | '.join('---' for _ in headers) + ' |\n')
+            for ser in range(1, count + 1):
+                cells = [category, str(ser), f"{category} Feature {ser}"]
+                cells += [synthetic_cell(rng, references, technical) for _ in names]
+                cells.append(f"Explanation of feature {ser}")
+                f.write('| ' + ' | '.join(cells) + ' |\n')
+            f.write('\n')
+        f.write("## References\n\n")
+        for n in range(1, references + 1):
+            f.write(f'[{n}]: https://example.com/source/{n} "Source {n}"\n')
+
+def file_size(filename):
+    return Path(filename).stat().st_size if Path(filename).exists() else 0
+
+def build_stages(markdown_file, out_dir):
+    """Return (name, callable) pairs; each callable returns (rows, output file or bytes)"""
+    state = {}
+    
+    def parse():
+        state['tables'] = [t for t in read_comparison_tables(markdown_file) if t]
+        return sum(len(t) for t in state['tables']), markdown_file
+    
+    def per_table(write, suffix):
+        def stage():
+            rows = 0
+            total = 0
+            for i, table in enumerate(state['tables']):
+                filename = os.path.join(out_dir, f"table_{i+1}{suffix}")
+                write(table, filename)
+                rows += len(table)
+                total += file_size(filename)
+            return rows, total
+        return stage
+    
+    stages = [
+        ('parse', parse),
+        ('csv', per_table(lambda t, f: create_csv_from_table({'headers': t.headers, 'data': t.iter_rows()}, f), '.csv')),
+        ('json', per_table(lambda t, f: create_json_from_table({'headers': t.headers, 'data': t.iter_rows()}, f), '.json')),
+        ('formatted_csv', per_table(lambda t, f: create_formatted_csv_from_data(t.iter_data(), f), '_formatted.csv')),
+        ('html', per_table(lambda t, f: create_html_from_data(t.iter_data(), f), '.html'))
+    ]
+    if reportlab_available():
+        stages.append(('pdf', per_table(lambda t, f: create_pdf_from_data(t, f), '.pdf')))
+    return stages
+
+def measure(stage, repeat):
+    """Time a stage repeat times, then rerun it once under tracemalloc"""
+    wall_times = []
+    cpu_times = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            rows, output = stage()
+            cpu_times.append(time.process_time() - cpu_start)
+            wall_times.append(time.perf_counter() - wall_start)
+    
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            stage()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        'wall_s': min(wall_times),
+        'cpu_s': min(cpu_times),
+        'peak_bytes': peak,
+        'rows': rows,
+        'bytes': output if isinstance(output, int) else file_size(output)
+    }
+
+def run_benchmarks(features, platforms, references, repeat=3, seed=0):
+    """Run every stage on a fresh synthetic document and return the results"""
+    with tempfile.TemporaryDirectory() as out_dir:
+        markdown_file = os.path.join(out_dir, 'synthetic_comparison.md')
+        write_synthetic_markdown(markdown_file, features, platforms, references, seed)
+        
+        results = {}
+        for name, stage in build_stages(markdown_file, out_dir):
+            results[name] = measure(stage, repeat)
+    
+    return {
+        'params': {
+            'features': features,
+            'platforms': platforms,
+            'references': references,
+            'repeat': repeat,
+            'seed': seed
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'machine': platform.machine()
+        },
+        'stages': results
+    }
+
+def compare_to_baseline(results, baseline, threshold):
+    """Print stage ratios against a baseline and return the regressed stages"""
+    regressions = []
+    print(f"\n{'Stage':<15}{'Wall (s)':>12}{'Baseline':>12}{'Ratio':>8}{'Peak MB':>10}{'Ratio':>8}")
+    for name, stage in results['stages'].items():
+        base = baseline.get('stages', {}).get(name)
+        if not base:
+            print(f"{name:<15}{stage['wall_s']:>12.4f}{'-':>12}{'-':>8}{stage['peak_bytes'] / 1e6:>10.2f}{'-':>8}")
+            continue
+        wall_ratio = stage['wall_s'] / base['wall_s'] if base['wall_s'] else 1.0
+        peak_ratio = stage['peak_bytes'] / base['peak_bytes'] if base['peak_bytes'] else 1.0
+        flag = ' REGRESSION' if wall_ratio > threshold or peak_ratio > threshold else ''
+        print(f"{name:<15}{stage['wall_s']:>12.4f}{base['wall_s']:>12.4f}{wall_ratio:>8.2f}"
+              f"{stage['peak_bytes'] / 1e6:>10.2f}{peak_ratio:>8.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def print_results(results):
+    print(f"\n{'Stage':<15}{'Wall (s)':>12}{'CPU (s)':>12}{'Peak MB':>10}{'Rows':>10}{'Output MB':>12}")
+    for name, stage in results['stages'].items():
+        print(f"{name:<15}{stage['wall_s']:>12.4f}{stage['cpu_s']:>12.4f}{stage['peak_bytes'] / 1e6:>10.2f}"
+              f"{stage['rows']:>10}{stage['bytes'] / 1e6:>12.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--features', type=int, default=1000, help='feature rows across both tables')
+    parser.add_argument('--platforms', type=int, default=12, help='platform columns per table')
+    parser.add_argument('--references', type=int, default=50, help='reference footnotes to cite')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per stage (best is kept)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark_results.json', help='where to save the results')
+    parser.add_argument('--baseline', help='earlier results file to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='ratio above which a stage counts as a regression')
+    parser.add_argument('--write-markdown', metavar='FILE',
+                        help='only write a synthetic markdown document and exit')
+    args = parser.parse_args()
+    
+    if args.write_markdown:
+        write_synthetic_markdown(args.write_markdown, args.features, args.platforms, args.references, args.seed)
+        print(f"Created Markdown: {args.write_markdown}")
+        return
+    
+    if not reportlab_available():
+        print("reportlab is not installed; skipping the pdf stage")
+    
+    results = run_benchmarks(args.features, args.platforms, args.references, args.repeat, args.seed)
+    print_results(results)
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved results: {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressed stages: {', '.join(regressions)}")
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
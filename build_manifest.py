@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Content-hash build manifest shared by the comparison generators
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+MANIFEST_FILE = '.build_manifest.json'
+
+def hash_bytes(data):
+    """Return the SHA-256 hex digest of a bytes object"""
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(filename, chunk_size=1 << 16):
+    """Return the SHA-256 hex digest of a file, or None if it is missing"""
+    digest = hashlib.sha256()
+    try:
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+def hash_modules(modules):
+    """Return one hash covering the code of several modules next to this file"""
+    here = Path(__file__).parent
+    return hash_bytes(''.join(str(hash_file(here / m)) for m in modules).encode())
+
+class BuildManifest:
+    """Record input and output hashes so unchanged targets can be skipped.
+
+    Each entry is keyed by a target name and stores the input fingerprints
+    it was built from plus the hash of every output file. A target is up to
+    date when its inputs match and all of its outputs are still on disk
+    with the recorded content.
+    """
+
+    def __init__(self, filename=MANIFEST_FILE):
+        self.filename = filename
+        self.entries = {}
+        if Path(filename).exists():
+            try:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                print(f"Ignoring unreadable manifest: {filename}")
+                self.entries = {}
+
+    def is_up_to_date(self, key, inputs, outputs):
+        """Return True if the target was built from these inputs and is intact"""
+        entry = self.entries.get(key)
+        if not entry or entry.get('inputs') != inputs:
+            return False
+        recorded = entry.get('outputs', {})
+        if sorted(recorded) != sorted(str(o) for o in outputs):
+            return False
+        return all(hash_file(o) == recorded[str(o)] for o in outputs)
+
+    def record(self, key, inputs, outputs):
+        """Store the inputs and output hashes of a freshly built target"""
+        hashes = {str(o): hash_file(o) for o in outputs}
+        if None in hashes.values():
+            # Nothing usable was written, so never treat it as up to date
+            self.entries.pop(key, None)
+            return
+        self.entries[key] = {'inputs': inputs, 'outputs': hashes}
+
+    def save(self):
+        """Write the manifest atomically"""
+        tmp_filename = f"{self.filename}.tmp"
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_filename, self.filename)
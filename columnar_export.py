@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Columnar binary export of comparison tables with memory-mapped reads
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+NPY_MAGIC = b'\x93NUMPY'
+NPY_ALIGNMENT = 64
+
+def columnar_filenames(prefix):
+    """Return the (codes, dictionary) file names for an export prefix"""
+    return f"{prefix}.codes.npy", f"{prefix}.dict.json"
+
+def _npy_header(shape):
+    """Build a version 1.0 .npy header for a C-ordered little-endian uint32 array"""
+    header = "{'descr': '<u4', 'fortran_order': False, 'shape': %r, }" % (shape,)
+    padding = NPY_ALIGNMENT - (len(NPY_MAGIC) + 4 + len(header) + 1) % NPY_ALIGNMENT
+    header = header + ' ' * (padding % NPY_ALIGNMENT) + '\n'
+    return NPY_MAGIC + b'\x01\x00' + struct.pack('<H', len(header)) + header.encode('latin1')
+
+def create_columnar_from_table(table, prefix):
+    """Write a ComparisonTable as a dictionary-encoded columnar export.
+    
+    The codes go to <prefix>.codes.npy as a (columns, rows) uint32 array, so
+    every column is one contiguous block that numpy.load(..., mmap_mode='r')
+    or open_columnar_table() can page in on its own. The distinct values of
+    each column go to <prefix>.dict.json.
+    """
+    codes_filename, dict_filename = columnar_filenames(prefix)
+    row_count = len(table)
+    
+    with open(codes_filename, 'wb') as codesfile:
+        codesfile.write(_npy_header((len(table.columns), row_count)))
+        for column in table.columns:
+            codes = array('I', column.codes)
+            if sys.byteorder == 'big':
+                codes.byteswap()
+            codesfile.write(codes.tobytes())
+    
+    with open(dict_filename, 'w', encoding='utf-8') as dictfile:
+        json.dump({
+            'headers': table.headers,
+            'rows': row_count,
+            'values': [column.values for column in table.columns]
+        }, dictfile, ensure_ascii=False)
+    
+    print(f"Created columnar: {codes_filename}, {dict_filename}")
+    return [codes_filename, dict_filename]
+
+class MappedColumn:
+    """One column of a columnar export, decoded lazily from a memory map"""
+    
+    __slots__ = ('values', 'codes')
+    
+    def __init__(self, values, codes):
+        self.values = values
+        self.codes = codes
+    
+    def __len__(self):
+        return len(self.codes)
+    
+    def __getitem__(self, i):
+        return self.values[self.codes[i]]
+    
+    def __iter__(self):
+        values = self.values
+        for code in self.codes:
+            yield values[code]
+
+class ColumnarTable:
+    """Read-only, memory-mapped view of a columnar export.
+    
+    Only the dictionary file is parsed up front; a column's codes are read
+    from the mapped file when that column is requested. Columns borrow the
+    map, so drop them before calling close().
+    """
+    
+    def __init__(self, prefix):
+        codes_filename, dict_filename = columnar_filenames(prefix)
+        with open(dict_filename, 'r', encoding='utf-8') as dictfile:
+            meta = json.load(dictfile)
+        self.headers = meta['headers']
+        self.rows = meta['rows']
+        self._values = meta['values']
+        
+        self._file = open(codes_filename, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(NPY_MAGIC)] != NPY_MAGIC:
+            self.close()
+            raise ValueError(f"Not a .npy file: {codes_filename}")
+        header_len = struct.unpack('<H', self._map[8:10])[0]
+        self._offset = 10 + header_len
+    
+    def __len__(self):
+        return self.rows
+    
+    def column(self, header):
+        """Return the column with the given header without reading the others"""
+        j = self.headers.index(header)
+        start = self._offset + j * self.rows * 4
+        codes = memoryview(self._map)[start:start + self.rows * 4]
+        if sys.byteorder == 'big':
+            codes = array('I', codes.tobytes())
+            codes.byteswap()
+        else:
+            codes = codes.cast('I')
+        return MappedColumn(self._values[j], codes)
+    
+    def close(self):
+        self._map.close()
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def open_columnar_table(prefix):
+    """Open a columnar export written by create_columnar_from_table"""
+    return ColumnarTable(prefix)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Build and query a SQLite index of the video platform comparison tables
+"""
+
+import argparse
+import os
+import sqlite3
+from pathlib import Path
+
+from comparison_table import KEY_HEADERS
+
+SCHEMA = """
+CREATE TABLE comparison_tables (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    UNIQUE (source, number)
+);
+CREATE TABLE features (
+    id INTEGER PRIMARY KEY,
+    table_id INTEGER NOT NULL REFERENCES comparison_tables(id),
+    category TEXT,
+    ser TEXT,
+    topic_name TEXT,
+    remark TEXT
+);
+CREATE TABLE platforms (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE cell_values (
+    id INTEGER PRIMARY KEY,
+    feature_id INTEGER NOT NULL REFERENCES features(id),
+    platform_id INTEGER NOT NULL REFERENCES platforms(id),
+    value TEXT NOT NULL
+);
+CREATE INDEX features_topic ON features(topic_name);
+CREATE INDEX cell_values_feature ON cell_values(feature_id);
+CREATE INDEX cell_values_platform ON cell_values(platform_id, value);
+CREATE VIRTUAL TABLE cell_search USING fts5(topic_name, value, remark, content='');
+"""
+
+def build_index(db_filename, tables):
+    """Build a fresh index from (source, number, ComparisonTable) entries.
+    
+    The database is written to a temporary file and moved into place, so
+    readers never see a half-built index.
+    """
+    tmp_filename = f"{db_filename}.tmp"
+    if Path(tmp_filename).exists():
+        os.remove(tmp_filename)
+    
+    conn = sqlite3.connect(tmp_filename)
+    try:
+        conn.executescript(SCHEMA)
+        platform_ids = {}
+        with conn:
+            for source, number, table in tables:
+                table_id = conn.execute(
+                    "INSERT INTO comparison_tables (source, number) VALUES (?, ?)",
+                    (source, number)
+                ).lastrowid
+                index_table(conn, table_id, table, platform_ids)
+        conn.execute("INSERT INTO cell_search (cell_search) VALUES ('optimize')")
+        conn.commit()
+    finally:
+        conn.close()
+    
+    os.replace(tmp_filename, db_filename)
+    print(f"Created SQLite index: {db_filename}")
+
+def index_table(conn, table_id, table, platform_ids):
+    """Insert the features and cells of one ComparisonTable"""
+    headers = table.headers
+    key = {h: headers.index(h) for h in KEY_HEADERS if h in headers}
+    remark_header = table.remark_header
+    remark_index = headers.index(remark_header) if remark_header else None
+    platform_columns = []
+    for name in table.platforms:
+        if name not in platform_ids:
+            platform_ids[name] = conn.execute(
+                "INSERT INTO platforms (name) VALUES (?)", (name,)
+            ).lastrowid
+        platform_columns.append((headers.index(name), platform_ids[name]))
+    
+    for row in table.iter_rows():
+        topic_name = row[key['Topic Name']] if 'Topic Name' in key else None
+        remark = row[remark_index] if remark_index is not None else None
+        feature_id = conn.execute(
+            "INSERT INTO features (table_id, category, ser, topic_name, remark) VALUES (?, ?, ?, ?, ?)",
+            (
+                table_id,
+                row[key['Category']] if 'Category' in key else None,
+                row[key['Ser']] if 'Ser' in key else None,
+                topic_name,
+                remark
+            )
+        ).lastrowid
+        for j, platform_id in platform_columns:
+            cell_id = conn.execute(
+                "INSERT INTO cell_values (feature_id, platform_id, value) VALUES (?, ?, ?)",
+                (feature_id, platform_id, row[j])
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO cell_search (rowid, topic_name, value, remark) VALUES (?, ?, ?, ?)",
+                (cell_id, topic_name or '', row[j], remark or '')
+            )
+
+CELL_QUERY = """
+SELECT t.source, t.number, f.ser, f.topic_name, p.name, c.value
+FROM cell_values c
+JOIN features f ON f.id = c.feature_id
+JOIN comparison_tables t ON t.id = f.table_id
+JOIN platforms p ON p.id = c.platform_id
+"""
+
+def fts_query(text):
+    """Quote each whitespace-separated term as an FTS5 string, so 'end-to-end' or 'Go/C++' match literally"""
+    terms = text.split()
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+def search_cells(conn, query, limit=50, raw=False):
+    """Full-text search over topic names, cell text and remarks.
+    
+    Every term must match; with raw=True the query is passed to FTS5 as-is
+    so column filters, prefixes and operators can be used.
+    """
+    if not raw:
+        query = fts_query(query)
+        if not query:
+            return []
+    return conn.execute(
+        CELL_QUERY + "WHERE c.id IN (SELECT rowid FROM cell_search WHERE cell_search MATCH ? ORDER BY rank LIMIT ?)"
+        " ORDER BY t.source, t.number, f.id, p.id",
+        (query, limit)
+    ).fetchall()
+
+def feature_cells(conn, topic_name):
+    """Return every platform cell for the features with this topic name"""
+    return conn.execute(
+        CELL_QUERY + "WHERE f.topic_name = ? ORDER BY t.source, t.number, f.id, p.id",
+        (topic_name,)
+    ).fetchall()
+
+def platform_cells(conn, platform):
+    """Return every feature cell for one platform"""
+    return conn.execute(
+        CELL_QUERY + "WHERE p.name = ? ORDER BY t.source, t.number, f.id",
+        (platform,)
+    ).fetchall()
+
+def print_rows(rows):
+    for source, number, ser, topic_name, platform, value in rows:
+        print(f"{source} #{number} [{ser}] {topic_name} | {platform}: {value}")
+    print(f"({len(rows)} rows)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('database', help='index built by generate_excel.py --sqlite')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    search_parser = subparsers.add_parser('search', help='full-text search, e.g. "E2EE" or "end-to-end"')
+    search_parser.add_argument('query')
+    search_parser.add_argument('--limit', type=int, default=50)
+    search_parser.add_argument('--raw', action='store_true',
+                               help='pass the query to FTS5 unquoted, e.g. "topic_name:mute" or "enc*"')
+    subparsers.add_parser('feature', help='show all platforms for one topic name').add_argument('topic_name')
+    subparsers.add_parser('platform', help='show all features for one platform').add_argument('platform')
+    args = parser.parse_args()
+    
+    if not Path(args.database).exists():
+        print(f"Database not found: {args.database}")
+        raise SystemExit(1)
+    
+    conn = sqlite3.connect(f"file:{args.database}?mode=ro", uri=True)
+    try:
+        if args.command == 'search':
+            try:
+                rows = search_cells(conn, args.query, args.limit, args.raw)
+            except sqlite3.OperationalError as e:
+                search_parser.error(f"invalid search query {args.query!r}: {e}")
+            print_rows(rows)
+        elif args.command == 'feature':
+            print_rows(feature_cells(conn, args.topic_name))
+        else:
+            print_rows(platform_cells(conn, args.platform))
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Compact columnar model for video platform comparison tables
+"""
+
+import csv
+from array import array
+
+KEY_HEADERS = ('Category', 'Ser', 'Topic Name')
+REMARK_PREFIX = 'Rmk'
+
+class DictColumn:
+    """A dictionary-encoded column of strings.
+    
+    Each distinct value is stored once; rows hold a small integer code into
+    the value list, so the thousands of repeated '✅' and '❌' cells share a
+    single string.
+    """
+    
+    __slots__ = ('values', 'codes', '_index')
+    
+    def __init__(self):
+        self.values = []
+        self.codes = array('I')
+        self._index = {}
+    
+    def append(self, value):
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self._index[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+    
+    def __len__(self):
+        return len(self.codes)
+    
+    def __getitem__(self, i):
+        return self.values[self.codes[i]]
+    
+    def __iter__(self):
+        values = self.values
+        for code in self.codes:
+            yield values[code]
+
+class ComparisonTable:
+    """A comparison table stored column by column.
+    
+    Headers follow the markdown sources: 'Category', 'Ser' and 'Topic Name'
+    key columns, one column per platform, and a trailing 'Rmk / ...'
+    explanation column.
+    """
+    
+    __slots__ = ('headers', 'columns', '_positions')
+    
+    def __init__(self, headers):
+        self.headers = list(headers)
+        self.columns = [DictColumn() for _ in self.headers]
+        self._positions = {}
+        for i, header in enumerate(self.headers):
+            self._positions.setdefault(header, i)
+    
+    @classmethod
+    def from_rows(cls, headers, rows):
+        """Build a table from headers and an iterable of data rows"""
+        table = cls(headers)
+        for row in rows:
+            table.append(row)
+        return table
+    
+    @classmethod
+    def from_data(cls, data):
+        """Build a table from an iterable of rows whose first row is the header"""
+        rows = iter(data)
+        return cls.from_rows(next(rows, []), rows)
+    
+    @classmethod
+    def from_csv(cls, csv_filename):
+        """Build a table from a CSV file written by generate_excel.py"""
+        with open(csv_filename, 'r', encoding='utf-8', newline='') as csvfile:
+            return cls.from_data(csv.reader(csvfile))
+    
+    def append(self, row):
+        """Add one data row; short rows are padded with empty cells"""
+        for i, column in enumerate(self.columns):
+            column.append(row[i] if i < len(row) else '')
+    
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+    
+    def row(self, i):
+        """Return data row i as a list of strings"""
+        return [column[i] for column in self.columns]
+    
+    def iter_rows(self):
+        """Yield every data row as a list of strings"""
+        for i in range(len(self)):
+            yield self.row(i)
+    
+    def iter_data(self):
+        """Yield the header row followed by every data row"""
+        yield list(self.headers)
+        yield from self.iter_rows()
+    
+    def column(self, header):
+        """Return the column with the given header"""
+        return self.columns[self._positions[header]]
+    
+    @property
+    def platforms(self):
+        """Names of the per-platform columns, in header order"""
+        return [h for h in self.headers
+                if h not in KEY_HEADERS and not h.startswith(REMARK_PREFIX)]
+    
+    @property
+    def remark_header(self):
+        """Header of the explanation column, or None if there is none"""
+        for header in self.headers:
+            if header.startswith(REMARK_PREFIX):
+                return header
+        return None
+    
+    def platform(self, name):
+        """Return the column of cells for one platform"""
+        if name not in self.platforms:
+            raise KeyError(name)
+        return self.column(name)
+    
+    def categories(self):
+        return self.column('Category')
+    
+    def topic_names(self):
+        return self.column('Topic Name')
+    
+    def remarks(self):
+        header = self.remark_header
+        if header is None:
+            raise KeyError(REMARK_PREFIX)
+        return self.column(header)
+    
+    def serials(self):
+        """Return the 'Ser' column as ints, with None for non-numeric cells"""
+        return [int(value) if value.isascii() and value.isdigit() else None for value in self.column('Ser')]
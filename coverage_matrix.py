@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Feature-coverage matrix, platform scores and platform similarity for comparison tables
+"""
+
+import argparse
+import json
+from array import array
+from pathlib import Path
+
+from comparison_table import ComparisonTable
+
+# Support levels, one byte per (platform, feature) cell
+UNKNOWN = 0
+NO = 1
+PARTIAL = 2
+YES = 3
+LEVEL_NAMES = {UNKNOWN: 'unknown', NO: 'no', PARTIAL: 'partial', YES: 'yes'}
+
+# Qualifiers that turn a '✅' into partial support
+PARTIAL_QUALIFIERS = ('only', 'plugin', 'not native', 'varies', 'limited', 'partial')
+
+# Byte maps used to derive masks from a row of levels with bytes.translate
+KNOWN_MASK = bytes([0] + [1] * 255)
+UNKNOWN_MASK = bytes([1] + [0] * 255)
+
+def support_level(value):
+    """Classify one cell as YES, PARTIAL, NO or UNKNOWN"""
+    text = value.strip()
+    if text.startswith('❌'):
+        return NO
+    if text.startswith('⚠'):
+        return PARTIAL
+    if text.startswith('✅'):
+        qualifier = text[1:].lower()
+        return PARTIAL if any(word in qualifier for word in PARTIAL_QUALIFIERS) else YES
+    return UNKNOWN
+
+def encode_column(column):
+    """Return the support levels of a DictColumn as bytes.
+    
+    Each distinct value is classified once. With fewer than 256 distinct
+    values (the normal case) the codes are mapped to levels in a single
+    bytes.translate call instead of a Python loop over the rows.
+    """
+    levels = bytes(support_level(value) for value in column.values)
+    if len(levels) <= 256:
+        return array('B', column.codes).tobytes().translate(levels.ljust(256, b'\0'))
+    return bytes(levels[code] for code in column.codes)
+
+def count_bytes(data, value):
+    return data.count(value.to_bytes(1, 'little'))
+
+def masked_count(a, b):
+    """Count positions where two 0/1 byte masks are both 1"""
+    both = int.from_bytes(a, 'little') & int.from_bytes(b, 'little')
+    return both.to_bytes(len(a), 'little').count(1)
+
+class SupportMatrix:
+    """Support levels of every platform for every feature.
+    
+    Levels are stored platform by platform in one bytes object, so each
+    platform's row is a contiguous slice. Scores and similarities are
+    computed with bytes.count, bytes.translate and big-integer bitwise
+    operations, all of which run in C over whole rows.
+    """
+    
+    __slots__ = ('platforms', 'features', 'data')
+    
+    def __init__(self, platforms, features, data):
+        self.platforms = platforms
+        self.features = features  # (category, ser, topic name) per feature
+        self.data = data
+    
+    @classmethod
+    def from_tables(cls, tables):
+        """Build the matrix from ComparisonTables, stacking their features.
+        
+        A platform missing from one of the tables is UNKNOWN for its features.
+        """
+        tables = list(tables)
+        platforms = list(dict.fromkeys(p for table in tables for p in table.platforms))
+        features = []
+        rows = {platform: [] for platform in platforms}
+        for table in tables:
+            categories = table.column('Category') if 'Category' in table.headers else [''] * len(table)
+            sers = table.column('Ser') if 'Ser' in table.headers else [''] * len(table)
+            topics = table.column('Topic Name') if 'Topic Name' in table.headers else [''] * len(table)
+            features.extend(zip(categories, sers, topics))
+            table_platforms = set(table.platforms)
+            for platform in platforms:
+                if platform in table_platforms:
+                    rows[platform].append(encode_column(table.platform(platform)))
+                else:
+                    rows[platform].append(bytes(len(table)))
+        data = b''.join(b''.join(rows[platform]) for platform in platforms)
+        return cls(platforms, features, data)
+    
+    @property
+    def shape(self):
+        return len(self.platforms), len(self.features)
+    
+    def row(self, platform):
+        """Return the levels of one platform as bytes"""
+        i = self.platforms.index(platform) if isinstance(platform, str) else platform
+        n = len(self.features)
+        return self.data[i * n:(i + 1) * n]
+    
+    def to_numpy(self):
+        """Return the matrix as a (platforms, features) uint8 NumPy array (needs numpy)"""
+        import numpy
+        return numpy.frombuffer(self.data, dtype=numpy.uint8).reshape(self.shape)
+    
+    def coverage(self, start=0, stop=None):
+        """Return per-platform level counts and a score over features start..stop-1.
+        
+        The score counts partial support as half and ignores unknown cells.
+        """
+        results = {}
+        for i, platform in enumerate(self.platforms):
+            row = self.row(i)[start:stop]
+            counts = {name: count_bytes(row, level) for level, name in LEVEL_NAMES.items()}
+            known = counts['yes'] + counts['partial'] + counts['no']
+            counts['score'] = (counts['yes'] + 0.5 * counts['partial']) / known if known else None
+            results[platform] = counts
+        return results
+    
+    def category_ranges(self):
+        """Return (category, start, stop) for each run of features in one category"""
+        ranges = []
+        for j, (category, _, _) in enumerate(self.features):
+            if ranges and ranges[-1][0] == category and ranges[-1][2] == j:
+                ranges[-1][2] = j + 1
+            else:
+                ranges.append([category, j, j + 1])
+        return [tuple(r) for r in ranges]
+    
+    def category_scores(self):
+        """Return {category: {platform: score}} rolled up over each category's features"""
+        totals = {}
+        for category, start, stop in self.category_ranges():
+            for platform, counts in self.coverage(start, stop).items():
+                total = totals.setdefault(category, {}).setdefault(platform, [0.0, 0])
+                total[0] += counts['yes'] + 0.5 * counts['partial']
+                total[1] += counts['yes'] + counts['partial'] + counts['no']
+        return {
+            category: {platform: (points / known if known else None) for platform, (points, known) in scores.items()}
+            for category, scores in totals.items()
+        }
+    
+    def similarity(self):
+        """Return the platform x platform agreement matrix as nested lists.
+        
+        Entry (i, j) is the share of features known for both platforms on
+        which they have the same support level, or None if there are none.
+        """
+        n = len(self.features)
+        rows = [int.from_bytes(self.row(i), 'little') for i in range(len(self.platforms))]
+        known = [self.row(i).translate(KNOWN_MASK) for i in range(len(self.platforms))]
+        unknown = [self.row(i).translate(UNKNOWN_MASK) for i in range(len(self.platforms))]
+        
+        matrix = [[None] * len(self.platforms) for _ in self.platforms]
+        for i in range(len(self.platforms)):
+            for j in range(i, len(self.platforms)):
+                both_known = masked_count(known[i], known[j])
+                if not both_known:
+                    continue
+                # Equal bytes XOR to zero; drop the positions where both are unknown
+                equal = (rows[i] ^ rows[j]).to_bytes(n, 'little').count(0)
+                agree = equal - masked_count(unknown[i], unknown[j])
+                matrix[i][j] = matrix[j][i] = agree / both_known
+        return matrix
+
+def print_report(matrix):
+    coverage = matrix.coverage()
+    print(f"\n{'Platform':<20}{'Yes':>6}{'Partial':>9}{'No':>6}{'Unknown':>9}{'Score':>8}")
+    for platform, counts in sorted(coverage.items(), key=lambda item: -(item[1]['score'] or 0)):
+        score = f"{counts['score']:.2f}" if counts['score'] is not None else '-'
+        print(f"{platform:<20}{counts['yes']:>6}{counts['partial']:>9}{counts['no']:>6}{counts['unknown']:>9}{score:>8}")
+    
+    print("\nCategory scores")
+    for category, scores in matrix.category_scores().items():
+        values = ', '.join(f"{p}: {s:.2f}" for p, s in scores.items() if s is not None)
+        print(f"{category}: {values}")
+    
+    print("\nPlatform similarity")
+    short = [p[:8] for p in matrix.platforms]
+    print(' ' * 20 + ''.join(f"{name:>9}" for name in short))
+    for platform, row in zip(matrix.platforms, matrix.similarity()):
+        print(f"{platform:<20}" + ''.join(f"{v:>9.2f}" if v is not None else f"{'-':>9}" for v in row))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('csv_files', nargs='*', default=[
+        'video_platform_comparison_table_2.csv',
+        'video_platform_comparison_practical_table_2.csv'
+    ], help='table CSVs written by generate_excel.py (default: the two UI/UX tables)')
+    parser.add_argument('--separate', action='store_true', help='report each file on its own instead of stacking them')
+    parser.add_argument('--json', metavar='FILE', help='also write coverage, category scores and similarity as JSON')
+    args = parser.parse_args()
+    
+    missing = [f for f in args.csv_files if not Path(f).exists()]
+    if missing:
+        print(f"CSV file not found: {', '.join(missing)}")
+        raise SystemExit(1)
+    
+    tables = [ComparisonTable.from_csv(f) for f in args.csv_files]
+    groups = [[t] for t in tables] if args.separate else [tables]
+    labels = args.csv_files if args.separate else [', '.join(args.csv_files)]
+    
+    report = {}
+    for label, group in zip(labels, groups):
+        matrix = SupportMatrix.from_tables(group)
+        print(f"\n{label}: {matrix.shape[0]} platforms x {matrix.shape[1]} features")
+        print_report(matrix)
+        report[label] = {
+            'platforms': matrix.platforms,
+            'coverage': matrix.coverage(),
+            'category_scores': matrix.category_scores(),
+            'similarity': matrix.similarity()
+        }
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nCreated JSON: {args.json}")
+
+if __name__ == "__main__":
+    main()
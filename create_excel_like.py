@@ -3,29 +3,57 @@
 Create Excel-like files from video platform comparison data
 """
 
+import argparse
 import csv
-import json
 from pathlib import Path
 
-def create_formatted_csv(csv_filename, formatted_filename, title="Video Platform Comparison"):
+from build_manifest import BuildManifest, hash_file, hash_modules
+from csv_source import open_csv_source
+from output_files import add_output_arguments, check_compression, finish_output, open_output, output_variants
+from profiling import PROFILER, add_profile_argument, report_profile, stage
+from summary_data import load_summary
+from xlsx_writer import create_xlsx_from_tables
+
+# Modules whose code shapes the outputs; their hashes are a manifest input of every output
+GENERATOR_MODULES = [
+    'create_excel_like.py',
+    'comparison_table.py',
+    'csv_source.py',
+    'output_files.py',
+    'section_index.py',
+    'summary_data.py'
+]
+
+WORKBOOK_FILE = "video_platform_comparison.xlsx"
+
+def create_formatted_csv(csv_filename, formatted_filename, title="Video Platform Comparison", compression=None,
+                         checksums=False):
     """Create a formatted CSV file with better structure"""
     if not Path(csv_filename).exists():
         print(f"CSV file not found: {csv_filename}")
         return
     
-    # Read CSV data
-    data = []
-    with open(csv_filename, 'r', encoding='utf-8') as csvfile:
-        reader = csv.reader(csvfile)
-        for row in reader:
-            data.append(row)
+    # Index the memory-mapped CSV, then stream its rows into the writer
+    with stage('read csv', csv_filename) as s:
+        source = open_csv_source(csv_filename)
+        s.rows = len(source)
     
-    if not data:
-        print(f"No data found in {csv_filename}")
-        return
+    # An empty CSV still writes a formatted file, so no stale one is recorded as up to date
+    with source:
+        if not source.headers:
+            print(f"No data found in {csv_filename}")
+        
+        create_formatted_csv_from_data(source.iter_data(), formatted_filename, title, compression, checksums)
+
+def create_formatted_csv_from_data(data, formatted_filename, title="Video Platform Comparison", compression=None,
+                                   checksums=False):
+    """Create a formatted CSV file from an iterable of rows (header row first)"""
+    rows = iter(data)
+    headers = next(rows, [])
     
     # Create formatted CSV with better structure
-    with open(formatted_filename, 'w', newline='', encoding='utf-8') as csvfile:
+    with stage('emit formatted csv', formatted_filename) as s, \
+            open_output(formatted_filename, compression, newline='') as csvfile:
         writer = csv.writer(csvfile)
         
         # Add title row
@@ -33,77 +61,122 @@ def create_formatted_csv(csv_filename, formatted_filename, title="Video Platform
         writer.writerow([])  # Empty row
         
         # Add headers
-        writer.writerow(data[0])
+        writer.writerow(headers)
         
         # Add separator line
-        separator = ['---'] * len(data[0])
+        separator = ['---'] * len(headers)
         writer.writerow(separator)
         
         # Add data rows
-        for row in data[1:]:
+        row_count = 0
+        for row in rows:
             writer.writerow(row)
+            row_count += 1
+        
+        s.rows = row_count
         
         # Add summary row
         writer.writerow([])
-        writer.writerow(['Summary', 'Total Features', str(len(data)-1), '', '', '', '', '', '', '', '', '', '', '', '', '', ''])
+        writer.writerow(['Summary', 'Total Features', str(row_count), '', '', '', '', '', '', '', '', '', '', '', '', '', ''])
     
     print(f"Created formatted CSV: {formatted_filename}")
+    finish_output(formatted_filename, compression, checksums)
+
+def iter_workbook_sheets(sheets):
+    """Yield (sheet title, rows) for each existing CSV, streaming rows from the mapped file"""
+    for csv_filename, sheet_title in sheets:
+        if not Path(csv_filename).exists():
+            print(f"CSV file not found: {csv_filename}")
+            continue
+        with open_csv_source(csv_filename) as source:
+            yield sheet_title, source.iter_data()
+
+def create_workbook(sheets, xlsx_filename=WORKBOOK_FILE):
+    """Create one XLSX workbook with a sheet per (csv file, sheet title) pair"""
+    with stage('emit xlsx', xlsx_filename):
+        create_xlsx_from_tables(iter_workbook_sheets(sheets), xlsx_filename)
 
-def create_summary_csv():
+def create_summary_csv(summary=None, compression=None, checksums=False):
     """Create a summary CSV file with all comparison data"""
+    summary = summary or load_summary()
     summary_data = [
         ['Video Platform Comparison Summary'],
         [''],
         ['Overview'],
         ['Feature Category', 'Count', 'Description'],
-        ['---', '---', '---'],
-        ['Technical Settings', '20', 'Backend languages, codecs, encryption, etc.'],
-        ['UI/UX Features', '100', 'User interface and experience features'],
-        ['Platforms Compared', '15', 'Major video calling platforms'],
-        ['Additional Platforms', '40+', 'Emerging and specialized platforms'],
+        ['---', '---', '---']
+    ]
+    for label, count, description in summary.categories:
+        summary_data.append([label, str(count), description])
+    summary_data.append(['Platforms Compared', str(len(summary.platforms)), 'Major video calling platforms'])
+    summary_data.append(['Additional Platforms', str(len(summary.additional_platforms)), 'Emerging and specialized platforms'])
+    
+    summary_data += [
         [''],
         ['Platforms Included'],
         ['Platform', 'Type', 'Key Features'],
-        ['---', '---', '---'],
-        ['Jitsi Meet', 'Open Source', 'Self-hosted, WebRTC, Free'],
-        ['Google Meet', 'Enterprise', 'Google Workspace integration'],
-        ['Zoom', 'Commercial', 'Wide adoption, extensive features'],
-        ['Microsoft Teams', 'Enterprise', 'Microsoft 365 integration'],
-        ['Cisco Webex', 'Enterprise', 'Cisco ecosystem integration'],
-        ['Discord', 'Community', 'Gaming and community focus'],
-        ['Slack', 'Business', 'Team collaboration focus'],
-        ['BlueJeans', 'Enterprise', 'Verizon enterprise platform'],
-        ['RingCentral', 'Business', 'Unified communications'],
-        ['8x8', 'Business', 'Cloud communications'],
-        ['Whereby', 'Simple', 'Browser-based, easy to use'],
-        ['Loom', 'Recording', 'Video messaging and screen recording'],
+        ['---', '---', '---']
+    ]
+    for platform in summary.platforms:
+        summary_data.append([platform, *summary.platform_notes(platform)])
+    
+    summary_data += [
         [''],
         ['Generated Files'],
         ['File Type', 'Filename', 'Description'],
-        ['---', '---', '---'],
-        ['CSV', 'video_platform_comparison_table_1.csv', 'Technical Settings Comparison'],
-        ['CSV', 'video_platform_comparison_table_2.csv', 'UI/UX Features Comparison'],
-        ['CSV', 'video_platform_comparison_practical_table_1.csv', 'Technical Settings (Practical)'],
-        ['CSV', 'video_platform_comparison_practical_table_2.csv', 'UI/UX Features (Practical)'],
-        ['HTML', 'technical_comparison.html', 'Technical Settings (Printable)'],
-        ['HTML', 'uiux_comparison.html', 'UI/UX Features (Printable)'],
-        ['HTML', 'technical_comparison_practical.html', 'Technical Settings (Practical, Printable)'],
-        ['HTML', 'uiux_comparison_practical.html', 'UI/UX Features (Practical, Printable)'],
-        ['JSON', 'video_platform_comparison_table_1.json', 'Technical Settings (JSON format)'],
-        ['JSON', 'video_platform_comparison_table_2.json', 'UI/UX Features (JSON format)'],
-        ['JSON', 'video_platform_comparison_practical_table_1.json', 'Technical Settings (Practical, JSON)'],
-        ['JSON', 'video_platform_comparison_practical_table_2.json', 'UI/UX Features (Practical, JSON)']
+        ['---', '---', '---']
     ]
+    summary_data.extend(list(f) for f in summary.files)
     
-    with open("video_platform_comparison_summary.csv", 'w', newline='', encoding='utf-8') as csvfile:
+    with open_output("video_platform_comparison_summary.csv", compression, newline='') as csvfile:
         writer = csv.writer(csvfile)
         for row in summary_data:
             writer.writerow(row)
     
     print("Created CSV: video_platform_comparison_summary.csv")
+    finish_output("video_platform_comparison_summary.csv", compression, checksums)
+
+# Highlights listed under each feature category of the README; the counts come from the tables
+README_FEATURE_HIGHLIGHTS = {
+    'Technical Settings': [
+        'Backend Language, Frontend Language, Bandwidth Adaptability',
+        'Video Resolution, Codec, Encryption Used, External API Calls',
+        'STUN Server Location, Mobile SDK Support, WebRTC Implementation',
+        'Cloud Infrastructure, Recording Capability, Analytics & Monitoring',
+        'SSO Integration, Compliance Standards, Multi-tenant Support',
+        'Auto-scaling, Load Balancing, CDN Integration, Database Technology'
+    ],
+    'UI/UX Features': [
+        'Meeting controls (mute, camera, waiting room)',
+        'Collaboration features (chat, whiteboard, screen sharing)',
+        'Integration options (calendar, API, SDK, webhooks)',
+        'AI features (meeting assistant, smart summaries)',
+        'Analytics and monitoring features',
+        'Settings and configuration options'
+    ]
+}
 
-def create_readme():
-    """Create a README file with instructions"""
+def readme_name_lines(names, per_line=5):
+    return [f"- {', '.join(names[i:i + per_line])}" for i in range(0, len(names), per_line)]
+
+def readme_platform_sections(summary):
+    """Return the 'Platforms Compared' and 'Features Analyzed' sections of the README"""
+    lines = ["## Platforms Compared", ""]
+    lines.append(f"### Major Platforms ({len(summary.platforms)}):")
+    lines += readme_name_lines(summary.platforms)
+    lines.append("")
+    lines.append(f"### Additional Platforms ({len(summary.additional_platforms)}):")
+    lines += readme_name_lines(summary.additional_platforms)
+    lines += ["", "## Features Analyzed", ""]
+    for label, count, description in summary.categories:
+        lines.append(f"### {label} ({count} features):")
+        lines += [f"- {highlight}" for highlight in README_FEATURE_HIGHLIGHTS.get(label, [description])]
+        lines.append("")
+    return '\n'.join(lines)
+
+def create_readme(summary=None):
+    """Create a README file with instructions; platform and feature counts come from the tables"""
+    summary = summary or load_summary()
     readme_content = """# Video Platform Comparison Files
 
 This directory contains comprehensive comparison files for video calling platforms.
@@ -117,6 +190,9 @@ This directory contains comprehensive comparison files for video calling platfor
 - `video_platform_comparison_practical_table_2.csv` - UI/UX Features (Practical)
 - `video_platform_comparison_summary.csv` - Summary and overview
 
+### Excel Workbook
+- `video_platform_comparison.xlsx` - All four tables, one sheet each, with frozen headers and filters
+
 ### HTML Files (Printable)
 - `technical_comparison.html` - Technical Settings Comparison (print to PDF)
 - `uiux_comparison.html` - UI/UX Features Comparison (print to PDF)
@@ -133,7 +209,7 @@ This directory contains comprehensive comparison files for video calling platfor
 ## Usage Instructions
 
 ### For Excel/Spreadsheet Users:
-1. Open any `.csv` file in Excel, Google Sheets, or LibreOffice Calc
+1. Open `video_platform_comparison.xlsx`, or any `.csv` file, in Excel, Google Sheets, or LibreOffice Calc
 2. The data will be automatically formatted in a table
 3. You can sort, filter, and analyze the data as needed
 
@@ -148,36 +224,44 @@ This directory contains comprehensive comparison files for video calling platfor
 2. Import into data analysis tools like Python, R, or Tableau
 3. The JSON format preserves all data structure
 
-## Platforms Compared
+## Regenerating the Files
 
-### Major Platforms (15):
-- Jitsi Meet, Google Meet, Zoom, Microsoft Teams, Cisco Webex
-- Discord, Slack, BlueJeans, RingCentral, 8x8
-- Whereby, Loom, and more
+Every script skips outputs whose inputs are unchanged; pass `--force` to rebuild everything.
+`--profile` prints per-stage timings for any generator.
 
-### Additional Platforms (40+):
-- Emerging platforms: Calendly, Cal.com, Tandem, Gather, Spatial
-- Enterprise platforms: Vonage, LogMeIn, TeamViewer, AnyDesk
-- Specialized platforms: Doxy.me, TheraNest, SimplePractice (healthcare)
+### All outputs in one run
+- `python pipeline.py` - Parse each markdown file once and write every output (`--no-pdf` skips ReportLab)
+- `python pipeline.py --watch` - Keep running and rebuild only the tables that change when a markdown file is saved
 
-## Features Analyzed
+### Individual generators
+- `python generate_excel.py` - Table CSV and JSON files
+  - `--by-section` - Name outputs after their markdown section and export the platform lists as JSON
+  - `--sqlite DB` - Also build a SQLite full-text index (see `comparison_index.py` below)
+  - `--json-lines`, `--compact-json` - One JSON object per line, or JSON without indentation
+  - `--columnar` - Also write memory-mappable column files
+  - `--references` - Also write the resolved citations of every cell as JSON
+- `python create_excel_like.py` - Formatted CSV files, the Excel workbook, the summary CSV and this README
+- `python generate_simple_pdf.py` - Printable HTML files and the summary HTML
+  - `--viewer` - Also write `<name>_viewer.html`, an interactive page with search, filters and sorting
+  - `--jobs N` - Render up to N files in parallel
+- `python generate_pdf.py` - PDF files (needs `reportlab`)
+  - `--paginate` - Split large tables into page-sized chunks and column bands
+- `--compress gzip|zstd` and `--checksums` (generate_excel, create_excel_like, generate_simple_pdf) -
+  Also write compressed copies (zstd needs `zstandard`) and `.sha256` files
 
-### Technical Settings (20 features):
-- Backend Language, Frontend Language, Bandwidth Adaptability
-- Video Resolution, Codec, Encryption Used, External API Calls
-- STUN Server Location, Mobile SDK Support, WebRTC Implementation
-- Cloud Infrastructure, Recording Capability, Analytics & Monitoring
-- SSO Integration, Compliance Standards, Multi-tenant Support
-- Auto-scaling, Load Balancing, CDN Integration, Database Technology
+### Many documents
+- `python batch.py 'docs/**/*.md' -o output` - Write the outputs of every matching document into its own folder under `output/`
 
-### UI/UX Features (100 features):
-- Meeting controls (mute, camera, waiting room)
-- Collaboration features (chat, whiteboard, screen sharing)
-- Integration options (calendar, API, SDK, webhooks)
-- AI features (meeting assistant, smart summaries)
-- Analytics and monitoring features
-- Settings and configuration options
+### Querying and analysis
+- `python query_server.py` - Serve the tables as JSON on http://127.0.0.1:8000/tables, reloading when the markdown changes
+- `python comparison_index.py index.db search "end-to-end"` - Full-text search of an index built with `--sqlite`
+  (`feature` and `platform` subcommands list one topic or one platform; `search --raw` accepts FTS5 syntax)
+- `python coverage_matrix.py` - Feature coverage scores per platform and category, and platform similarity
+- `python snapshot_diff.py old.csv new.csv` - Cell-level changes between dated snapshots of a table
+- `python section_index.py video_platform_comparison.md` - List the sections of a markdown file, or print one with `--section`
+- `python benchmark.py` - Time every generator stage on synthetic documents and compare against a baseline
 
+{platforms}
 ## Data Sources
 
 The comparison is based on:
@@ -198,11 +282,11 @@ For questions or suggestions, please refer to the main comparison document.
 """
     
     with open("README.md", 'w', encoding='utf-8') as readmefile:
-        readmefile.write(readme_content)
+        readmefile.write(readme_content.replace('{platforms}', readme_platform_sections(summary), 1))
     
     print("Created README: README.md")
 
-def main():
+def main(force=False, compression=None, checksums=False):
     # Create formatted CSV files
     csv_files = [
         ("video_platform_comparison_table_1.csv", "technical_comparison_formatted.csv", "Technical Settings Comparison"),
@@ -211,13 +295,64 @@ def main():
         ("video_platform_comparison_practical_table_2.csv", "uiux_comparison_practical_formatted.csv", "UI/UX Features Comparison (Practical)")
     ]
     
+    # Sheet names are limited to 31 characters
+    sheets = [
+        ("video_platform_comparison_table_1.csv", "Technical Settings"),
+        ("video_platform_comparison_table_2.csv", "UI-UX Features"),
+        ("video_platform_comparison_practical_table_1.csv", "Technical Settings (Practical)"),
+        ("video_platform_comparison_practical_table_2.csv", "UI-UX Features (Practical)")
+    ]
+    
+    manifest = BuildManifest()
+    script_hash = hash_modules(GENERATOR_MODULES)
+    
     for csv_file, formatted_file, title in csv_files:
         if Path(csv_file).exists():
-            create_formatted_csv(csv_file, formatted_file, title)
+            inputs = {'script': script_hash, 'source': hash_file(csv_file), 'title': title,
+                      'compression': compression, 'checksums': checksums}
+            outputs = output_variants(formatted_file, compression, checksums)
+            if not force and manifest.is_up_to_date(formatted_file, inputs, outputs):
+                print(f"Up to date: {formatted_file}")
+                continue
+            create_formatted_csv(csv_file, formatted_file, title, compression, checksums)
+            manifest.record(formatted_file, inputs, outputs)
+    
+    # Create the workbook with every table
+    inputs = {'script': script_hash, 'writer': hash_file(Path(__file__).with_name('xlsx_writer.py')),
+              'sources': [hash_file(csv_file) for csv_file, _ in sheets]}
+    if not force and manifest.is_up_to_date(WORKBOOK_FILE, inputs, [WORKBOOK_FILE]):
+        print(f"Up to date: {WORKBOOK_FILE}")
+    else:
+        create_workbook(sheets)
+        manifest.record(WORKBOOK_FILE, inputs, [WORKBOOK_FILE])
+    
+    # Create summary files; both are built from the tables and outputs on disk, and only
+    # the summary CSV gets compressed copies and checksums
+    summary = load_summary()
+    summaries = [
+        ("video_platform_comparison_summary.csv", create_summary_csv, (summary, compression, checksums),
+         output_variants("video_platform_comparison_summary.csv", compression, checksums)),
+        ("README.md", create_readme, (summary,), ["README.md"])
+    ]
+    for output_file, create, args, outputs in summaries:
+        inputs = {'script': script_hash, 'compression': compression, 'checksums': checksums,
+                  'summary': summary.digest()}
+        if not force and manifest.is_up_to_date(output_file, inputs, outputs):
+            print(f"Up to date: {output_file}")
+            continue
+        create(*args)
+        manifest.record(output_file, inputs, outputs)
     
-    # Create summary files
-    create_summary_csv()
-    create_readme()
+    manifest.save()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--force', action='store_true', help='rebuild every output even if unchanged')
+    add_output_arguments(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    check_compression(parser, args.compress)
+    if args.profile:
+        PROFILER.enable()
+    main(force=args.force, compression=args.compress, checksums=args.checksums)
+    report_profile(args.profile)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped CSV source with a row-offset index for streaming and random access
+"""
+
+import csv
+import io
+import mmap
+import re
+from array import array
+
+# One CSV record: unquoted text and quoted fields (which may contain
+# newlines or doubled quotes) up to the first newline outside quotes
+RECORD_END = re.compile(rb'[^"\n]*(?:"[^"]*"[^"\n]*)*\n')
+
+class CSVSource:
+    """A CSV file read through a memory map.
+    
+    Opening the source only scans the bytes for record boundaries and keeps
+    their offsets in a compact array; no row is decoded until it is asked
+    for. Rows can then be streamed in order, or fetched by index or range
+    without parsing what comes before them.
+    """
+    
+    def __init__(self, filename, chunk_rows=1024):
+        self.filename = filename
+        self.chunk_rows = chunk_rows
+        self._file = open(filename, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files cannot be mapped
+            self._map = b''
+        self.offsets = self._index_records()
+        self.headers = self._parse(0, 1)[0] if len(self.offsets) > 1 else []
+    
+    def _index_records(self):
+        """Return the start offset of every record, plus the end of the data"""
+        data = self._map
+        size = len(data)
+        offsets = array('Q')
+        pos = 0
+        while pos < size:
+            offsets.append(pos)
+            match = RECORD_END.match(data, pos)
+            # The last record may lack a newline (or hold an unterminated quote)
+            pos = match.end() if match else size
+        offsets.append(size)
+        return offsets
+    
+    def _parse(self, start, stop):
+        """Decode and parse records start..stop-1 (0 is the header)"""
+        text = self._map[self.offsets[start]:self.offsets[stop]].decode('utf-8')
+        return list(csv.reader(io.StringIO(text, newline='')))
+    
+    def __len__(self):
+        """Number of data rows, not counting the header"""
+        return max(len(self.offsets) - 2, 0)
+    
+    def row(self, i):
+        """Return data row i without parsing the rows before it"""
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._parse(i + 1, i + 2)[0]
+    
+    def iter_rows(self, start=0, stop=None):
+        """Yield data rows start..stop-1, decoding chunk_rows records at a time"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for chunk_start in range(start, stop, self.chunk_rows):
+            chunk_stop = min(chunk_start + self.chunk_rows, stop)
+            yield from self._parse(chunk_start + 1, chunk_stop + 1)
+    
+    def iter_data(self):
+        """Yield the header row followed by every data row"""
+        yield list(self.headers)
+        yield from self.iter_rows()
+    
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def open_csv_source(filename):
+    """Open a CSV file as a memory-mapped CSVSource"""
+    return CSVSource(filename)
@@ -3,98 +3,389 @@
 Generate Excel files from video platform comparison data
 """
 
+import argparse
 import csv
+import hashlib
 import json
-import re
 from pathlib import Path
 
+from build_manifest import BuildManifest, hash_file, hash_modules
+from columnar_export import columnar_filenames, create_columnar_from_table
+from comparison_index import build_index
+from comparison_table import ComparisonTable
+from output_files import add_output_arguments, check_compression, finish_output, open_output, output_variants
+from profiling import PROFILER, add_profile_argument, report_profile, stage
+from references import ReferenceIndex, create_references_json
+from section_index import SECTION_PLATFORM_LIST, SectionIndex
+
+# Modules whose code shapes the outputs; their hashes are a manifest input of every output
+GENERATOR_MODULES = [
+    'generate_excel.py',
+    'columnar_export.py',
+    'comparison_table.py',
+    'output_files.py',
+    'references.py',
+    'section_index.py'
+]
+
+def is_table_line(line):
+    """Return True if the line belongs to a markdown pipe table"""
+    return line.strip().startswith('|')
+
+def split_table_row(line):
+    """Split a markdown table line into stripped cell values"""
+    return [cell.strip() for cell in line.rstrip('\r\n').split('|')[1:-1]]
+
+def iter_table_rows(headers, first_line, lines):
+    """Yield data rows of a table, reading lines until the table ends"""
+    line = first_line
+    while True:
+        if line.strip() and '|' in line:
+            cells = split_table_row(line)
+            if len(cells) == len(headers):
+                yield cells
+        line = next(lines, None)
+        if line is None or not is_table_line(line):
+            return
+
+def iter_markdown_tables(lines):
+    """Yield markdown tables one at a time from an iterable of lines.
+
+    Each table is a dict with 'headers' and a lazy 'data' row iterator that
+    shares the underlying line iterator, so rows must be consumed before the
+    next table is requested; unconsumed rows are skipped. Blocks that are
+    too short to be a table yield None to keep positional numbering stable.
+    """
+    lines = iter(lines)
+    for line in lines:
+        if not is_table_line(line):
+            continue
+        
+        # A table needs a header, a separator and at least one more line
+        block = [line]
+        for line in lines:
+            if not is_table_line(line):
+                break
+            block.append(line)
+            if len(block) == 3:
+                break
+        
+        if len(block) < 3:
+            yield None
+            continue
+        
+        headers = split_table_row(block[0])
+        rows = iter_table_rows(headers, block[2], lines)
+        yield {
+            'headers': headers,
+            'data': rows
+        }
+        
+        # Skip whatever the consumer left unread
+        for _ in rows:
+            pass
+
+def iter_markdown_file(filename):
+    """Stream tables from a markdown file without loading it into memory"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        yield from iter_markdown_tables(f)
+
+def read_comparison_tables(filename):
+    """Yield each table of a markdown file as a compact ComparisonTable.
+
+    Tables are built one at a time while the file is streamed; blocks that
+    are too short to be a table yield None, as in iter_markdown_tables.
+    """
+    for table in iter_markdown_file(filename):
+        if table:
+            table = ComparisonTable.from_rows(table['headers'], table['data'])
+        yield table
+
+def hash_markdown_tables(filename, references=None):
+    """Return a content hash for each table block in a markdown file.
+
+    Blocks are numbered exactly as iter_markdown_tables numbers them, so the
+    hashes line up with the _table_N outputs. If a ReferenceIndex is given,
+    the reference definitions are collected in the same pass.
+    """
+    hashes = []
+    digest = None
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            if is_table_line(line):
+                if digest is None:
+                    digest = hashlib.sha256()
+                digest.update(line.encode('utf-8'))
+            else:
+                if digest is not None:
+                    hashes.append(digest.hexdigest())
+                    digest = None
+                if references is not None:
+                    references.add_line(line)
+    if digest is not None:
+        hashes.append(digest.hexdigest())
+    return hashes
+
+def read_section_table(index, section, number):
+    """Parse one table of an indexed section, reading only that section's bytes.
+    
+    number is the positional table number recorded in section.tables.
+    """
+    position = section.tables.index(number)
+    for i, table in enumerate(iter_markdown_tables(index.iter_lines(section))):
+        if i == position:
+            return table
+    return None
+
 def parse_markdown_table(content):
     """Parse markdown table and return structured data"""
-    lines = content.split('\n')
     tables = []
-    current_table = []
-    in_table = False
-    
-    for line in lines:
-        if line.strip().startswith('|') and '|' in line:
-            if not in_table:
-                in_table = True
-            current_table.append(line)
-        elif in_table:
-            if line.strip() == '' or not line.strip().startswith('|'):
-                if current_table:
-                    tables.append(parse_single_table(current_table))
-                    current_table = []
-                in_table = False
-    
-    if current_table:
-        tables.append(parse_single_table(current_table))
-    
+    for table in iter_markdown_tables(content.split('\n')):
+        if table:
+            table = {'headers': table['headers'], 'data': list(table['data'])}
+        tables.append(table)
     return tables
 
 def parse_single_table(table_lines):
     """Parse a single markdown table"""
-    if len(table_lines) < 3:
-        return None
+    for table in iter_markdown_tables(table_lines):
+        if table:
+            table['data'] = list(table['data'])
+        return table
+    return None
+
+class JSONArrayWriter:
+    """Write a JSON array of row objects one element at a time.
+
+    With the default indent of 2 the output is byte-for-byte what
+    json.dump(..., indent=2) produces for the equivalent list, without
+    holding the list in memory; indent=None writes a compact array.
+    """
     
-    # Parse headers
-    header_line = table_lines[0]
-    headers = [h.strip() for h in header_line.split('|')[1:-1]]
+    def __init__(self, jsonfile, headers, indent=2):
+        self.jsonfile = jsonfile
+        self.headers = headers
+        self.indent = indent
+        if indent is None:
+            self.encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        else:
+            self.encoder = json.JSONEncoder(ensure_ascii=False, indent=indent)
+        self.count = 0
     
-    # Parse separator line (second line)
-    separator_line = table_lines[1]
+    def write(self, row):
+        element = self.encoder.encode(dict(zip(self.headers, row)))
+        if self.indent is None:
+            self.jsonfile.write('[' if self.count == 0 else ',')
+            self.jsonfile.write(element)
+        else:
+            pad = ' ' * self.indent
+            self.jsonfile.write(f'[\n{pad}' if self.count == 0 else f',\n{pad}')
+            self.jsonfile.write(element.replace('\n', f'\n{pad}'))
+        self.count += 1
     
-    # Parse data rows
-    data_rows = []
-    for line in table_lines[2:]:
-        if line.strip() and '|' in line:
-            cells = [cell.strip() for cell in line.split('|')[1:-1]]
-            if len(cells) == len(headers):
-                data_rows.append(cells)
+    def close(self):
+        if self.count == 0:
+            self.jsonfile.write('[]')
+        else:
+            self.jsonfile.write(']' if self.indent is None else '\n]')
+
+class JSONLinesWriter:
+    """Write one compact JSON object per line (NDJSON) as rows arrive"""
     
-    return {
-        'headers': headers,
-        'data': data_rows
-    }
+    def __init__(self, jsonfile, headers):
+        self.jsonfile = jsonfile
+        self.headers = headers
+        self.encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        self.count = 0
+    
+    def write(self, row):
+        self.jsonfile.write(self.encoder.encode(dict(zip(self.headers, row))))
+        self.jsonfile.write('\n')
+        self.count += 1
+    
+    def close(self):
+        pass
+
+def create_json_writer(jsonfile, headers, json_lines=False, compact=False):
+    """Return the row writer for the requested JSON output mode"""
+    if json_lines:
+        return JSONLinesWriter(jsonfile, headers)
+    return JSONArrayWriter(jsonfile, headers, indent=None if compact else 2)
+
+def json_extension(json_lines=False):
+    """Return the file extension used for a JSON output mode"""
+    return 'jsonl' if json_lines else 'json'
 
-def create_csv_from_table(table_data, filename):
+def create_csv_from_table(table_data, filename, compression=None, checksums=False):
     """Create CSV file from table data"""
     if not table_data:
         return
     
-    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+    with stage('emit csv', filename) as s, \
+            open_output(filename, compression, newline='') as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(table_data['headers'])
-        writer.writerows(table_data['data'])
+        for row in table_data['data']:
+            writer.writerow(row)
+            s.rows += 1
     
     print(f"Created CSV: {filename}")
+    finish_output(filename, compression, checksums)
+
+def create_json_from_table(table_data, filename, json_lines=False, compact=False, compression=None, checksums=False):
+    """Create JSON file from table data.
+
+    By default this is an indented array of row objects; json_lines=True
+    writes JSON Lines instead and compact=True drops the indentation.
+    """
+    if not table_data:
+        return
+    
+    with stage('emit json', filename) as s, \
+            open_output(filename, compression) as jsonfile:
+        writer = create_json_writer(jsonfile, table_data['headers'], json_lines, compact)
+        for row in table_data['data']:
+            writer.write(row)
+        writer.close()
+        s.rows = writer.count
+    
+    print(f"Created JSON: {filename}")
+    finish_output(filename, compression, checksums)
+
+def create_outputs_from_table(table_data, csv_filename, json_filename, json_lines=False, compact=False,
+                              compression=None, checksums=False):
+    """Create CSV and JSON files in a single pass over the table rows.
 
-def create_json_from_table(table_data, filename):
-    """Create JSON file from table data"""
+    Parsing is lazy, so the reported stage time includes reading the rows.
+    """
     if not table_data:
         return
     
-    # Convert to list of dictionaries
-    json_data = []
-    for row in table_data['data']:
-        row_dict = {}
-        for i, header in enumerate(table_data['headers']):
-            if i < len(row):
-                row_dict[header] = row[i]
-        json_data.append(row_dict)
+    with stage('parse+emit csv/json', csv_filename, json_filename) as s, \
+            open_output(csv_filename, compression, newline='') as csvfile, \
+            open_output(json_filename, compression) as jsonfile:
+        csv_writer = csv.writer(csvfile)
+        csv_writer.writerow(table_data['headers'])
+        json_writer = create_json_writer(jsonfile, table_data['headers'], json_lines, compact)
+        for row in table_data['data']:
+            csv_writer.writerow(row)
+            json_writer.write(row)
+        json_writer.close()
+        s.rows = json_writer.count
     
-    with open(filename, 'w', encoding='utf-8') as jsonfile:
-        json.dump(json_data, jsonfile, indent=2, ensure_ascii=False)
+    print(f"Created CSV: {csv_filename}")
+    print(f"Created JSON: {json_filename}")
+    finish_output(csv_filename, compression, checksums)
+    finish_output(json_filename, compression, checksums)
+
+def table_outputs(base_name, number, columnar=False, json_lines=False, compression=None, checksums=False):
+    """Return the files generated for one markdown table.
+
+    The CSV and JSON files come first, followed by any columnar export and
+    then the compressed copies and checksum files.
+    """
+    prefix = f"{base_name}_table_{number}"
+    outputs = [f"{prefix}.csv", f"{prefix}.{json_extension(json_lines)}"]
+    if columnar:
+        outputs.extend(columnar_filenames(prefix))
+    for filename in outputs[:2]:
+        outputs.extend(output_variants(filename, compression, checksums)[1:])
+    return outputs
+
+def section_prefix(base_name, section, number=None):
+    """Return the output prefix of a section, e.g. video_platform_comparison_ui_ux_features_comparison.
     
+    A second or later table in the same section gets its position appended.
+    """
+    prefix = f"{base_name}_{section.slug}"
+    if number is not None and section.tables.index(number) > 0:
+        prefix = f"{prefix}_{section.tables.index(number) + 1}"
+    return prefix
+
+def section_outputs(base_name, section, number=None, columnar=False, json_lines=False, compression=None,
+                    checksums=False):
+    """Return the files generated for one table or platform list, named after its section"""
+    prefix = section_prefix(base_name, section, number)
+    if number is None:
+        outputs = [f"{prefix}.json"]
+    else:
+        outputs = [f"{prefix}.csv", f"{prefix}.{json_extension(json_lines)}"]
+        if columnar:
+            outputs.extend(columnar_filenames(prefix))
+    for filename in outputs[:2] if number is not None else outputs:
+        outputs.extend(output_variants(filename, compression, checksums)[1:])
+    return outputs
+
+def create_platform_list_json(index, section, filename, compression=None, checksums=False):
+    """Write a numbered platform list section as structured JSON"""
+    data = {
+        'section': section.title,
+        'parent': section.parent.title if section.parent else None,
+        'platforms': index.platform_list(section)
+    }
+    with open_output(filename, compression) as jsonfile:
+        json.dump(data, jsonfile, indent=2, ensure_ascii=False)
     print(f"Created JSON: {filename}")
+    finish_output(filename, compression, checksums)
+
+def create_section_outputs(filename, index, manifest, inputs, force=False, columnar=False, json_lines=False,
+                           compact=False, compression=None, checksums=False):
+    """Write the outputs of every table and platform list section of an indexed markdown file.
+    
+    Outputs are named by section slug rather than by position, and each one
+    is rebuilt only when its section's content changed; a stale section is
+    read by seeking to its byte range, so the rest of the file is not parsed.
+    """
+    base_name = Path(filename).stem
+    for section in index:
+        if section.kind == SECTION_PLATFORM_LIST:
+            targets = [(None, section.digest)]
+        else:
+            targets = [(number, index.table_hashes[number - 1]) for number in section.tables]
+        for number, source_hash in targets:
+            outputs = section_outputs(base_name, section, number, columnar, json_lines, compression, checksums)
+            target_inputs = dict(inputs, source=source_hash)
+            if not force and manifest.is_up_to_date(outputs[0], target_inputs, outputs):
+                print(f"Up to date: {', '.join(outputs)}")
+                continue
+            if number is None:
+                create_platform_list_json(index, section, outputs[0], compression, checksums)
+                manifest.record(outputs[0], target_inputs, outputs)
+                continue
+            table = read_section_table(index, section, number)
+            if not table:
+                continue
+            if columnar:
+                model = ComparisonTable.from_rows(table['headers'], table['data'])
+                table = {'headers': model.headers, 'data': model.iter_rows()}
+            create_outputs_from_table(table, outputs[0], outputs[1], json_lines, compact, compression, checksums)
+            if columnar:
+                prefix = section_prefix(base_name, section, number)
+                with stage('emit columnar', *columnar_filenames(prefix)) as s:
+                    create_columnar_from_table(model, prefix)
+                    s.rows = len(model)
+            manifest.record(outputs[0], target_inputs, outputs)
 
-def main():
+def iter_index_tables(files):
+    """Yield (source, number, ComparisonTable) for every table in the files"""
+    for filename in files:
+        if Path(filename).exists():
+            for i, table in enumerate(read_comparison_tables(filename)):
+                if table:
+                    yield filename, i + 1, table
+
+def main(force=False, columnar=False, json_lines=False, compact=False, sqlite=None, references=False,
+         compression=None, checksums=False, by_section=False):
     # Read the markdown files
     files = [
         'video_platform_comparison.md',
         'video_platform_comparison_practical.md'
     ]
     
+    manifest = BuildManifest()
+    script_hash = hash_modules(GENERATOR_MODULES)
+    source_hashes = {}
+    
     for filename in files:
         if not Path(filename).exists():
             print(f"File not found: {filename}")
@@ -102,24 +393,103 @@ def main():
         
         print(f"\nProcessing: {filename}")
         
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Work out which tables changed since the last build
+        base_name = Path(filename).stem
+        reference_index = ReferenceIndex()
+        if by_section:
+            with stage('index sections', filename):
+                index = SectionIndex(filename, reference_index)
+            table_hashes = index.table_hashes
+        else:
+            with stage('hash tables', filename):
+                table_hashes = hash_markdown_tables(filename, reference_index)
+        source_hashes[filename] = table_hashes
         
-        # Parse tables
-        tables = parse_markdown_table(content)
+        # Optionally write the resolved citations of every table
+        if references:
+            references_file = f"{base_name}_references.json"
+            inputs = {'script': script_hash, 'sources': table_hashes, 'references': reference_index.digest()}
+            if not force and manifest.is_up_to_date(references_file, inputs, [references_file]):
+                print(f"Up to date: {references_file}")
+            else:
+                tables = ((i + 1, t) for i, t in enumerate(read_comparison_tables(filename)) if t)
+                create_references_json(reference_index, tables, references_file)
+                manifest.record(references_file, inputs, [references_file])
         
-        # Create output files for each table
-        base_name = Path(filename).stem
+        if by_section:
+            inputs = {'script': script_hash, 'columnar': columnar, 'json_lines': json_lines, 'compact': compact,
+                      'compression': compression, 'checksums': checksums}
+            create_section_outputs(filename, index, manifest, inputs, force, columnar, json_lines, compact,
+                                   compression, checksums)
+            continue
         
-        for i, table in enumerate(tables):
-            if table:
-                # Create CSV
-                csv_filename = f"{base_name}_table_{i+1}.csv"
-                create_csv_from_table(table, csv_filename)
-                
-                # Create JSON
-                json_filename = f"{base_name}_table_{i+1}.json"
-                create_json_from_table(table, json_filename)
+        stale = set()
+        for i, table_hash in enumerate(table_hashes):
+            outputs = table_outputs(base_name, i + 1, columnar, json_lines, compression, checksums)
+            inputs = {'script': script_hash, 'source': table_hash, 'columnar': columnar,
+                      'json_lines': json_lines, 'compact': compact, 'compression': compression,
+                      'checksums': checksums}
+            if force or not manifest.is_up_to_date(outputs[0], inputs, outputs):
+                stale.add(i)
+            else:
+                print(f"Up to date: {', '.join(outputs)}")
+        
+        if not stale:
+            continue
+        
+        # Create output files for each changed table as it is parsed
+        for i, table in enumerate(iter_markdown_file(filename)):
+            if table and i in stale:
+                outputs = table_outputs(base_name, i + 1, columnar, json_lines, compression, checksums)
+                if columnar:
+                    # The columnar export needs whole columns, so keep a compact copy
+                    model = ComparisonTable.from_rows(table['headers'], table['data'])
+                    table = {'headers': model.headers, 'data': model.iter_rows()}
+                create_outputs_from_table(table, outputs[0], outputs[1], json_lines, compact, compression, checksums)
+                if columnar:
+                    with stage('emit columnar', *columnar_filenames(f"{base_name}_table_{i+1}")) as s:
+                        create_columnar_from_table(model, f"{base_name}_table_{i+1}")
+                        s.rows = len(model)
+                inputs = {'script': script_hash, 'source': table_hashes[i], 'columnar': columnar,
+                          'json_lines': json_lines, 'compact': compact, 'compression': compression,
+                          'checksums': checksums}
+                manifest.record(outputs[0], inputs, outputs)
+    
+    # Optionally rebuild the queryable SQLite index over every table
+    if sqlite:
+        inputs = {'script': script_hash, 'index': hash_file(Path(__file__).with_name('comparison_index.py')),
+                  'sources': source_hashes}
+        if not force and manifest.is_up_to_date(sqlite, inputs, [sqlite]):
+            print(f"Up to date: {sqlite}")
+        else:
+            with stage('build sqlite index', sqlite):
+                build_index(sqlite, iter_index_tables(files))
+            manifest.record(sqlite, inputs, [sqlite])
+    
+    manifest.save()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--force', action='store_true', help='rebuild every output even if unchanged')
+    parser.add_argument('--columnar', action='store_true',
+                        help='also write memory-mappable _table_N.codes.npy/.dict.json exports')
+    parser.add_argument('--json-lines', action='store_true',
+                        help='write _table_N.jsonl with one JSON object per row instead of a JSON array')
+    parser.add_argument('--compact-json', action='store_true', help='write JSON arrays without indentation')
+    parser.add_argument('--sqlite', metavar='DB',
+                        help='also build a SQLite/FTS5 index of every table (query it with comparison_index.py)')
+    parser.add_argument('--references', action='store_true',
+                        help='also write <source>_references.json with the resolved [Label][n] citations of every cell')
+    parser.add_argument('--by-section', action='store_true',
+                        help='name outputs after their markdown section (<source>_<section>.csv) instead of '
+                             '_table_N, and also export the numbered platform lists as JSON')
+    add_output_arguments(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    check_compression(parser, args.compress)
+    if args.profile:
+        PROFILER.enable()
+    main(force=args.force, columnar=args.columnar, json_lines=args.json_lines, compact=args.compact_json,
+         sqlite=args.sqlite, references=args.references, compression=args.compress, checksums=args.checksums,
+         by_section=args.by_section)
+    report_profile(args.profile)
@@ -3,32 +3,301 @@
 Generate PDF files from video platform comparison data
 """
 
-import csv
-import json
+import argparse
+import html
+import importlib.util
 from pathlib import Path
-from reportlab.lib.pagesizes import letter, A4, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-
-def create_pdf_from_csv(csv_filename, pdf_filename, title="Video Platform Comparison"):
+
+from build_manifest import BuildManifest, hash_file, hash_modules
+from comparison_table import ComparisonTable
+from csv_source import open_csv_source
+from profiling import PROFILER, add_profile_argument, report_profile, stage
+from references import iter_citations, read_references
+from summary_data import load_summary
+from task_pool import default_jobs, run_tasks
+
+# Modules whose code shapes the outputs; their hashes are a manifest input of every output
+GENERATOR_MODULES = [
+    'generate_pdf.py',
+    'comparison_table.py',
+    'csv_source.py',
+    'references.py',
+    'section_index.py',
+    'summary_data.py'
+]
+
+# ReportLab is imported on first use; this matches reportlab.lib.units.inch
+inch = 72.0
+
+# Geometry used by the paginated table mode; row heights are measured from the wrapped text
+PDF_TITLE_HEIGHT = 60
+PDF_CELL_PADDING = 12  # left + right padding of a table cell
+PDF_CELL_VPADDING = 6  # top + bottom padding of a body cell
+PDF_HEADER_VPADDING = 15  # top + bottom padding of the header row
+PDF_FRAME_PADDING = 12
+PDF_MIN_COLUMN_WIDTH = 0.3*inch
+PDF_MAX_COLUMN_WIDTH = 2.5*inch
+PDF_KEY_COLUMNS = 3  # Category, Ser and Topic Name repeat in every column band
+
+_pdf_styles = None
+
+def reportlab_available():
+    """Return True if ReportLab can be imported, without importing it"""
+    return importlib.util.find_spec('reportlab') is not None
+
+def get_pdf_styles():
+    """Import ReportLab and build the shared paragraph and table styles once"""
+    global _pdf_styles
+    if _pdf_styles is None:
+        from reportlab.lib import colors
+        from reportlab.lib.enums import TA_CENTER, TA_LEFT
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import TableStyle
+        
+        styles = getSampleStyleSheet()
+        _pdf_styles = {
+            'table_title': ParagraphStyle(
+                'CustomTitle',
+                parent=styles['Heading1'],
+                fontSize=16,
+                spaceAfter=20,
+                alignment=TA_CENTER
+            ),
+            'summary_title': ParagraphStyle(
+                'CustomTitle',
+                parent=styles['Heading1'],
+                fontSize=18,
+                spaceAfter=20,
+                alignment=TA_CENTER
+            ),
+            'summary_text': ParagraphStyle(
+                'Normal',
+                parent=styles['Normal'],
+                fontSize=12,
+                spaceAfter=12,
+                alignment=TA_LEFT
+            ),
+            'references_title': ParagraphStyle(
+                'ReferencesTitle',
+                parent=styles['Heading2'],
+                fontSize=12,
+                spaceBefore=12,
+                spaceAfter=6
+            ),
+            'reference': ParagraphStyle(
+                'Reference',
+                parent=styles['Normal'],
+                fontSize=7,
+                leading=9,
+                alignment=TA_LEFT
+            ),
+            'cell': ParagraphStyle(
+                'TableCell',
+                parent=styles['Normal'],
+                fontName='Helvetica',
+                fontSize=6,
+                leading=7,
+                alignment=TA_CENTER
+            ),
+            'header_cell': ParagraphStyle(
+                'TableHeaderCell',
+                parent=styles['Normal'],
+                fontName='Helvetica-Bold',
+                fontSize=8,
+                leading=9.5,
+                textColor=colors.whitesmoke,
+                alignment=TA_CENTER
+            ),
+            'table': TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 1), (-1, -1), 6),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.beige]),
+            ])
+        }
+    return _pdf_styles
+
+def create_pdf_from_csv(csv_filename, pdf_filename, title="Video Platform Comparison", paginate=False,
+                        references=None):
     """Create PDF from CSV data"""
     if not Path(csv_filename).exists():
         print(f"CSV file not found: {csv_filename}")
         return
     
-    # Read CSV data
-    data = []
-    with open(csv_filename, 'r', encoding='utf-8') as csvfile:
-        reader = csv.reader(csvfile)
-        for row in reader:
-            data.append(row)
+    # Read CSV data into the compact table model
+    with stage('read csv', csv_filename) as s:
+        with open_csv_source(csv_filename) as source:
+            table = ComparisonTable.from_data(source.iter_data())
+        s.rows = len(table)
     
-    if not data:
-        print(f"No data found in {csv_filename}")
-        return
+    if not table.headers:
+        # Raise rather than return, so the caller does not record an old PDF as up to date
+        raise ValueError(f"No data found in {csv_filename}")
+    
+    create_pdf_from_data(table, pdf_filename, title, paginate, references)
+
+def cite_table(table, references):
+    """Return the table with citations shortened to 'Label [n]', and the cited numbers.
+    
+    The table is only copied when it actually cites a known reference.
+    """
+    cited = set()
+    for column in table.columns:
+        for value in column.values:
+            cited.update(n for _, n in iter_citations(value) if references.get(n))
+    if not cited:
+        return table, []
+    
+    rows = ([references.label_text(cell) for cell in row] for row in table.iter_rows())
+    return ComparisonTable.from_rows(table.headers, rows), sorted(cited)
+
+def create_reference_list(references, numbers, styles):
+    """Return flowables listing the cited references as clickable links"""
+    from reportlab.platypus import Paragraph
+    
+    flowables = [Paragraph("References", styles['references_title'])]
+    for number in numbers:
+        url, title = references.get(number)
+        link = f'<a href="{html.escape(url)}" color="blue">{html.escape(title or url, quote=False)}</a>'
+        flowables.append(Paragraph(f"[{number}] {link}", styles['reference']))
+    return flowables
+
+def compute_column_widths(table):
+    """Return a capped natural width per column.
+
+    Columns are dictionary-encoded, so each distinct cell value is measured
+    only once however often it repeats. Text in a capped column wraps.
+    """
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    
+    widths = []
+    for header, column in zip(table.headers, table.columns):
+        width = stringWidth(header, 'Helvetica-Bold', 8)
+        for value in column.values:
+            width = max(width, stringWidth(value, 'Helvetica', 6))
+        width = max(width + PDF_CELL_PADDING, PDF_MIN_COLUMN_WIDTH)
+        widths.append(min(width, PDF_MAX_COLUMN_WIDTH))
+    return widths
+
+def split_column_bands(widths, frame_width):
+    """Group column indexes into bands that each fit the page width.
+
+    The leading key columns are repeated in every band so the bands can be
+    read side by side.
+    """
+    key_columns = list(range(min(PDF_KEY_COLUMNS, len(widths))))
+    key_width = sum(widths[j] for j in key_columns)
+    
+    bands = []
+    current = []
+    used = key_width
+    for j in range(len(key_columns), len(widths)):
+        if current and used + widths[j] > frame_width:
+            bands.append(key_columns + current)
+            current = []
+            used = key_width
+        current.append(j)
+        used += widths[j]
+    if current or not bands:
+        bands.append(key_columns + current)
+    return bands
+
+def wrap_column(values, width, style):
+    """Return a (Paragraph, height) pair for each distinct value of a column wrapped to width"""
+    from reportlab.platypus import Paragraph
+    
+    cells = []
+    for value in values:
+        paragraph = Paragraph(html.escape(value, quote=False), style)
+        _, height = paragraph.wrap(width - PDF_CELL_PADDING, 1e9)
+        cells.append((paragraph, height))
+    return cells
+
+def create_paginated_tables(table, widths, frame_width, frame_height, styles):
+    """Return flowables rendering a table as page-sized tables in column bands.
+
+    Cells are Paragraphs wrapped to their column width, and a page takes
+    rows until their measured heights fill it. Each distinct value of a
+    column is wrapped once per band.
+    """
+    from reportlab.platypus import PageBreak, Paragraph, Table
+    
+    row_count = len(table)
+    flowables = []
+    for band in split_column_bands(widths, frame_width):
+        band_widths = [widths[j] for j in band]
+        scale = min(1.0, frame_width / sum(band_widths))
+        band_widths = [width * scale for width in band_widths]
+        band_columns = [table.columns[j] for j in band]
+        
+        headers = [Paragraph(html.escape(table.headers[j], quote=False), styles['header_cell']) for j in band]
+        header_height = max(h.wrap(w - PDF_CELL_PADDING, 1e9)[1] for h, w in zip(headers, band_widths))
+        header_height += PDF_HEADER_VPADDING
+        
+        cells = [wrap_column(column.values, width, styles['cell'])
+                 for column, width in zip(band_columns, band_widths)]
+        row_heights = [
+            max(column_cells[code][1] for column_cells, code in zip(cells, codes)) + PDF_CELL_VPADDING
+            for codes in zip(*(column.codes for column in band_columns))
+        ]
+        
+        start = 0
+        available = frame_height - (PDF_TITLE_HEIGHT if not flowables else 0) - header_height
+        while True:
+            # Always take at least one row so an oversized row cannot stall paging
+            end = start + 1
+            used = row_heights[start] if start < row_count else 0
+            while end < row_count and used + row_heights[end] <= available:
+                used += row_heights[end]
+                end += 1
+            end = min(end, row_count)
+            chunk = [
+                [column_cells[column.codes[i]][0] for column_cells, column in zip(cells, band_columns)]
+                for i in range(start, end)
+            ]
+            if flowables:
+                flowables.append(PageBreak())
+            chunk_table = Table(
+                [headers] + chunk,
+                colWidths=band_widths,
+                rowHeights=[header_height] + row_heights[start:end]
+            )
+            chunk_table.setStyle(styles['table'])
+            flowables.append(chunk_table)
+            
+            start = end
+            available = frame_height - header_height
+            if start >= row_count:
+                break
+    return flowables
+
+def create_pdf_from_data(data, pdf_filename, title="Video Platform Comparison", paginate=False,
+                         references=None):
+    """Create PDF from a ComparisonTable or an iterable of rows (header row first).
+
+    By default the whole table is handed to ReportLab as one Table. With
+    paginate=True column widths are measured once, cells are wrapped to
+    them, rows are split into page-sized tables by their measured heights
+    and wide column sets into bands, so layout time and memory grow
+    linearly with the row count. With a ReferenceIndex, cited
+    sources are listed as links after the table.
+    """
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+    
+    table = data if isinstance(data, ComparisonTable) else ComparisonTable.from_data(data)
+    cited = []
+    if references is not None:
+        table, cited = cite_table(table, references)
+    styles = get_pdf_styles()
     
     # Create PDF
     doc = SimpleDocTemplate(
@@ -37,132 +306,158 @@ def create_pdf_from_csv(csv_filename, pdf_filename, title="Video Platform Compar
         rightMargin=0.5*inch,
         leftMargin=0.5*inch,
         topMargin=0.5*inch,
-        bottomMargin=0.5*inch
+        bottomMargin=0.5*inch,
+        invariant=1  # reproducible output regardless of build order or time
     )
     
     # Create story (content)
     story = []
-    styles = getSampleStyleSheet()
     
     # Add title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        spaceAfter=20,
-        alignment=TA_CENTER
-    )
-    story.append(Paragraph(title, title_style))
+    story.append(Paragraph(title, styles['table_title']))
     story.append(Spacer(1, 12))
     
+    # Style the table
+    style = styles['table']
+    
     # Create table
-    table = Table(data)
+    if paginate:
+        story.extend(create_paginated_tables(
+            table,
+            compute_column_widths(table),
+            doc.width - PDF_FRAME_PADDING,
+            doc.height - PDF_FRAME_PADDING,
+            styles
+        ))
+    else:
+        full_table = Table(list(table.iter_data()))
+        full_table.setStyle(style)
+        story.append(full_table)
     
-    # Style the table
-    style = TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.beige]),
-    ])
-    
-    table.setStyle(style)
-    story.append(table)
+    if cited:
+        story.extend(create_reference_list(references, cited, styles))
     
     # Build PDF
-    doc.build(story)
+    with stage('build pdf', pdf_filename) as s:
+        doc.build(story)
+        s.rows = len(table)
     print(f"Created PDF: {pdf_filename}")
 
-def create_summary_pdf():
+def create_summary_pdf(summary=None):
     """Create a summary PDF with all comparison data"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    
+    summary = summary or load_summary()
+    styles = get_pdf_styles()
     doc = SimpleDocTemplate(
         "video_platform_comparison_summary.pdf",
         pagesize=A4,
         rightMargin=0.5*inch,
         leftMargin=0.5*inch,
         topMargin=0.5*inch,
-        bottomMargin=0.5*inch
+        bottomMargin=0.5*inch,
+        invariant=1  # reproducible output regardless of build order or time
     )
     
     story = []
-    styles = getSampleStyleSheet()
     
     # Add title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=20,
-        alignment=TA_CENTER
-    )
-    story.append(Paragraph("Video Platform Comparison Summary", title_style))
+    story.append(Paragraph("Video Platform Comparison Summary", styles['summary_title']))
     story.append(Spacer(1, 20))
     
-    # Add summary content
-    summary_text = """
-    This document contains comprehensive comparisons of video calling platforms including:
+    # Add summary content computed from the tables
+    normal_style = styles['summary_text']
+    lines = ["This document contains comprehensive comparisons of video calling platforms including:"]
+    lines += [f"• {html.escape(label)} ({count} features)" for label, count, _ in summary.categories]
+    lines.append(f"• Platform Coverage: {len(summary.platforms)} major platforms")
+    lines.append(f"• Additional Platforms: {len(summary.additional_platforms)} emerging and specialized platforms")
+    lines.append("")
+    lines.append("Platforms compared include:")
+    lines.append(f"• {html.escape(', '.join(summary.platforms))}")
+    lines.append("")
+    lines.append("For detailed comparisons, see the individual CSV and JSON files.")
     
-    • Technical Settings (20 features)
-    • UI/UX Features (100 features)
-    • Platform Coverage: 15 major platforms
-    • Additional Platforms: 40+ emerging and specialized platforms
-    
-    Platforms compared include:
-    • Jitsi Meet, Google Meet, Zoom, Microsoft Teams, Cisco Webex
-    • Discord, Slack, BlueJeans, RingCentral, 8x8
-    • Whereby, Loom, and many more
-    
-    For detailed comparisons, see the individual CSV and JSON files.
-    """
-    
-    normal_style = ParagraphStyle(
-        'Normal',
-        parent=styles['Normal'],
-        fontSize=12,
-        spaceAfter=12,
-        alignment=TA_LEFT
-    )
-    
-    story.append(Paragraph(summary_text, normal_style))
+    story.append(Paragraph("<br/>".join(lines), normal_style))
     story.append(Spacer(1, 20))
     
     # Add file list
-    files = [
-        "video_platform_comparison_table_1.csv - Technical Settings",
-        "video_platform_comparison_table_2.csv - UI/UX Features",
-        "video_platform_comparison_practical_table_1.csv - Technical Settings (Practical)",
-        "video_platform_comparison_practical_table_2.csv - UI/UX Features (Practical)"
-    ]
+    for filename, description in summary.files_of_type('CSV'):
+        story.append(Paragraph(f"• {html.escape(filename)} - {html.escape(description)}", normal_style))
     
-    for file_info in files:
-        story.append(Paragraph(f"• {file_info}", normal_style))
-    
-    doc.build(story)
+    with stage('build pdf', "video_platform_comparison_summary.pdf"):
+        doc.build(story)
     print("Created PDF: video_platform_comparison_summary.pdf")
 
-def main():
+def main(force=False, jobs=1, paginate=False):
     # Create PDFs from CSV files
     csv_files = [
-        ("video_platform_comparison_table_1.csv", "technical_comparison.pdf", "Technical Settings Comparison"),
-        ("video_platform_comparison_table_2.csv", "uiux_comparison.pdf", "UI/UX Features Comparison"),
-        ("video_platform_comparison_practical_table_1.csv", "technical_comparison_practical.pdf", "Technical Settings Comparison (Practical)"),
-        ("video_platform_comparison_practical_table_2.csv", "uiux_comparison_practical.pdf", "UI/UX Features Comparison (Practical)")
+        ("video_platform_comparison_table_1.csv", "technical_comparison.pdf", "Technical Settings Comparison", "video_platform_comparison.md"),
+        ("video_platform_comparison_table_2.csv", "uiux_comparison.pdf", "UI/UX Features Comparison", "video_platform_comparison.md"),
+        ("video_platform_comparison_practical_table_1.csv", "technical_comparison_practical.pdf", "Technical Settings Comparison (Practical)", "video_platform_comparison_practical.md"),
+        ("video_platform_comparison_practical_table_2.csv", "uiux_comparison_practical.pdf", "UI/UX Features Comparison (Practical)", "video_platform_comparison_practical.md")
     ]
     
-    for csv_file, pdf_file, title in csv_files:
+    manifest = BuildManifest()
+    script_hash = hash_modules(GENERATOR_MODULES)
+    
+    # Citations are resolved against the References section of each source
+    references = {}
+    for markdown_file in dict.fromkeys(f[3] for f in csv_files):
+        if Path(markdown_file).exists():
+            references[markdown_file] = read_references(markdown_file)
+    
+    # Collect the outputs that need rebuilding
+    tasks = []
+    for csv_file, pdf_file, title, markdown_file in csv_files:
         if Path(csv_file).exists():
-            create_pdf_from_csv(csv_file, pdf_file, title)
+            reference_index = references.get(markdown_file)
+            inputs = {'script': script_hash, 'source': hash_file(csv_file), 'title': title, 'paginate': paginate,
+                      'references': reference_index.digest() if reference_index else None}
+            if not force and manifest.is_up_to_date(pdf_file, inputs, [pdf_file]):
+                print(f"Up to date: {pdf_file}")
+                continue
+            tasks.append((pdf_file, inputs, create_pdf_from_csv, (csv_file, pdf_file, title, paginate, reference_index)))
+    
+    # Create summary PDF; it lists the table CSVs, which this script does not write
+    summary_file = "video_platform_comparison_summary.pdf"
+    summary = load_summary()
+    inputs = {'script': script_hash, 'summary': summary.digest()}
+    if not force and manifest.is_up_to_date(summary_file, inputs, [summary_file]):
+        print(f"Up to date: {summary_file}")
+    else:
+        tasks.append((summary_file, inputs, create_summary_pdf, (summary,)))
+    
+    if tasks and not reportlab_available():
+        print("reportlab is not installed; cannot build PDFs")
+        return len(tasks)
+    
+    # Render, possibly in parallel, and record results in a fixed order
+    errors = run_tasks([(func, args) for _, _, func, args in tasks], jobs)
+    failures = 0
+    for (output_file, inputs, _, _), error in zip(tasks, errors):
+        if error:
+            failures += 1
+            print(f"Failed: {output_file}: {error}")
+        else:
+            manifest.record(output_file, inputs, [output_file])
     
-    # Create summary PDF
-    create_summary_pdf()
+    manifest.save()
+    return failures
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--force', action='store_true', help='rebuild every output even if unchanged')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='render up to N documents in parallel (0 = one per CPU)')
+    parser.add_argument('--paginate', action='store_true',
+                        help='split large tables into page-sized row chunks and column bands')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    if args.profile:
+        PROFILER.enable()
+    jobs = args.jobs if args.jobs > 0 else default_jobs()
+    failures = main(force=args.force, jobs=jobs, paginate=args.paginate)
+    report_profile(args.profile)
+    if failures:
+        raise SystemExit(1)
@@ -3,29 +3,32 @@
 Generate simple PDF files from video platform comparison data using basic libraries
 """
 
-import csv
+import argparse
+import html
 import json
 from pathlib import Path
 
-def create_html_from_csv(csv_filename, html_filename, title="Video Platform Comparison"):
-    """Create HTML file from CSV data that can be converted to PDF"""
-    if not Path(csv_filename).exists():
-        print(f"CSV file not found: {csv_filename}")
-        return
-    
-    # Read CSV data
-    data = []
-    with open(csv_filename, 'r', encoding='utf-8') as csvfile:
-        reader = csv.reader(csvfile)
-        for row in reader:
-            data.append(row)
-    
-    if not data:
-        print(f"No data found in {csv_filename}")
-        return
-    
-    # Create HTML content
-    html_content = f"""
+from build_manifest import BuildManifest, hash_file, hash_modules
+from comparison_table import ComparisonTable
+from csv_source import open_csv_source
+from output_files import add_output_arguments, check_compression, finish_output, open_output, output_variants
+from profiling import PROFILER, add_profile_argument, report_profile, stage
+from references import iter_citations, read_references
+from summary_data import load_summary
+from task_pool import default_jobs, run_tasks
+
+# Modules whose code shapes the outputs; their hashes are a manifest input of every output
+GENERATOR_MODULES = [
+    'generate_simple_pdf.py',
+    'comparison_table.py',
+    'csv_source.py',
+    'output_files.py',
+    'references.py',
+    'section_index.py',
+    'summary_data.py'
+]
+
+HTML_TABLE_HEAD = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -85,40 +88,450 @@ def create_html_from_csv(csv_filename, html_filename, title="Video Platform Comp
         <thead>
             <tr>
 """
-    
-    # Add headers
-    for header in data[0]:
-        html_content += f'                <th>{header}</th>\n'
-    
-    html_content += "            </tr>\n        </thead>\n        <tbody>\n"
-    
-    # Add data rows
-    for i, row in enumerate(data[1:], 1):
-        html_content += "            <tr>\n"
-        for j, cell in enumerate(row):
-            if j == 0:  # First column (feature name)
-                html_content += f'                <td class="feature-name">{cell}</td>\n'
-            elif j == 1:  # Second column (serial number)
-                html_content += f'                <td>{cell}</td>\n'
-            else:  # Platform columns
-                html_content += f'                <td class="platform">{cell}</td>\n'
-        html_content += "            </tr>\n"
-    
-    html_content += """
+
+HTML_TABLE_FOOT = """
         </tbody>
     </table>
 </body>
 </html>
 """
+
+HTML_HEADER_CELL = '                <th>{}</th>\n'
+HTML_FEATURE_CELL = '                <td class="feature-name">{}</td>\n'
+HTML_SERIAL_CELL = '                <td>{}</td>\n'
+HTML_PLATFORM_CELL = '                <td class="platform">{}</td>\n'
+HTML_LINK = '<a href="{url}" title="{title}">{label}</a>'
+
+# Interactive viewer: the table is embedded once as dictionary-encoded JSON
+# and only the rows in view are turned into DOM nodes
+VIEWER_HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{title}</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            margin: 20px;
+            font-size: 12px;
+        }
+        h1 {
+            text-align: center;
+            color: #333;
+            margin-bottom: 10px;
+        }
+        .controls {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 8px 16px;
+            align-items: center;
+            margin-bottom: 8px;
+        }
+        .platform-toggles label {
+            margin-right: 8px;
+            white-space: nowrap;
+        }
+        #status {
+            color: #555;
+        }
+        #viewport {
+            height: calc(100vh - 190px);
+            min-height: 200px;
+            overflow: auto;
+            border: 1px solid #ddd;
+            position: relative;
+        }
+        .row {
+            display: grid;
+            height: 28px;
+            border-bottom: 1px solid #eee;
+        }
+        .row > div {
+            padding: 0 6px;
+            line-height: 28px;
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+            border-right: 1px solid #eee;
+        }
+        .header {
+            position: sticky;
+            top: 0;
+            z-index: 1;
+            background-color: #f2f2f2;
+            font-weight: bold;
+        }
+        .header > div {
+            cursor: pointer;
+            user-select: none;
+        }
+        .body-row {
+            position: absolute;
+            left: 0;
+        }
+        .body-row:nth-child(even) {
+            background-color: #f9f9f9;
+        }
+        .feature-name {
+            font-weight: bold;
+        }
+        .platform {
+            text-align: center;
+        }
+    </style>
+</head>
+<body>
+    <h1>{title}</h1>
+    <div class="controls">
+        <input id="search" type="search" placeholder="Search all visible columns" size="30">
+        <span>
+            <select id="filter-column"></select>
+            <input id="filter-value" type="search" placeholder="contains" size="16">
+        </span>
+        <span id="status"></span>
+        {print_link}
+    </div>
+    <div class="controls platform-toggles" id="platforms"></div>
+    <div id="viewport">
+        <div class="row header" id="header"></div>
+        <div id="rows"></div>
+    </div>
+    <script type="application/json" id="table-data">"""
+
+VIEWER_HTML_TAIL = """</script>
+    <script>
+(function () {
+    var data = JSON.parse(document.getElementById('table-data').textContent);
+    var headers = data.headers, values = data.values, codes = data.codes, links = data.links;
+    var ROW_HEIGHT = 28, OVERSCAN = 10;
+    var rowCount = codes.length ? codes[0].length : 0;
+    var isPlatform = headers.map(function (_, j) { return data.platforms.indexOf(j) !== -1; });
+    var hidden = headers.map(function () { return false; });
+    var sortColumn = -1, sortDirection = 1, order = [];
+
+    var viewport = document.getElementById('viewport');
+    var header = document.getElementById('header');
+    var rows = document.getElementById('rows');
+    var search = document.getElementById('search');
+    var filterColumn = document.getElementById('filter-column');
+    var filterValue = document.getElementById('filter-value');
+    var status = document.getElementById('status');
+
+    // Work on distinct values: lower-cased text, rendered HTML and sort rank
+    var collator = new Intl.Collator(undefined, {numeric: true, sensitivity: 'base'});
+    var lower = values.map(function (column) {
+        return column.map(function (v) { return v.toLowerCase(); });
+    });
+    var ranks = values.map(function (column) {
+        var sorted = column.map(function (_, k) { return k; });
+        sorted.sort(function (a, b) { return collator.compare(column[a], column[b]); });
+        var rank = new Array(column.length);
+        sorted.forEach(function (k, r) { rank[k] = r; });
+        return rank;
+    });
+    var rendered = values.map(function (column) { return new Array(column.length); });
+
+    function escapeHtml(text) {
+        return text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+    }
+
+    function formatCell(j, code) {
+        var html = rendered[j][code];
+        if (html === undefined) {
+            html = escapeHtml(values[j][code]).replace(/\\[([^\\[\\]]+)\\]\\[(\\d+)\\]/g, function (match, label, n) {
+                var link = links[n];
+                if (!link) {
+                    return match;
+                }
+                return '<a href="' + escapeHtml(link[0]) + '" title="' + escapeHtml(link[1]) + '">' + label + '</a>';
+            });
+            rendered[j][code] = html;
+        }
+        return html;
+    }
+
+    function visibleColumns() {
+        return headers.map(function (_, j) { return j; }).filter(function (j) { return !hidden[j]; });
+    }
+
+    function columnWidth(j) {
+        if (isPlatform[j]) {
+            return '140px';
+        }
+        return {'Category': '110px', 'Ser': '50px', 'Topic Name': '220px'}[headers[j]] || '320px';
+    }
+
+    function layout() {
+        var columns = visibleColumns();
+        var template = columns.map(columnWidth).join(' ');
+        header.style.gridTemplateColumns = template;
+        rows.style.gridTemplateColumns = template;
+        header.innerHTML = columns.map(function (j) {
+            var arrow = j === sortColumn ? (sortDirection > 0 ? ' \\u25B2' : ' \\u25BC') : '';
+            return '<div data-column="' + j + '" title="' + escapeHtml(headers[j]) + '">' +
+                escapeHtml(headers[j]) + arrow + '</div>';
+        }).join('');
+        header.style.width = rows.style.width = 'max-content';
+    }
+
+    function applyFilters() {
+        var query = search.value.trim().toLowerCase();
+        var column = +filterColumn.value;
+        var value = filterValue.value.trim().toLowerCase();
+        var columns = visibleColumns();
+        // Match each distinct value once instead of every cell
+        var queryMatch = query ? columns.map(function (j) {
+            return lower[j].map(function (v) { return v.indexOf(query) !== -1; });
+        }) : null;
+        var columnMatch = column >= 0 && value ? lower[column].map(function (v) {
+            return v.indexOf(value) !== -1;
+        }) : null;
+
+        order = [];
+        for (var i = 0; i < rowCount; i++) {
+            if (columnMatch && !columnMatch[codes[column][i]]) {
+                continue;
+            }
+            if (queryMatch) {
+                var found = false;
+                for (var k = 0; k < columns.length && !found; k++) {
+                    found = queryMatch[k][codes[columns[k]][i]];
+                }
+                if (!found) {
+                    continue;
+                }
+            }
+            order.push(i);
+        }
+        if (sortColumn >= 0) {
+            var sortCodes = codes[sortColumn], rank = ranks[sortColumn];
+            order.sort(function (a, b) {
+                return (rank[sortCodes[a]] - rank[sortCodes[b]]) * sortDirection || a - b;
+            });
+        }
+        status.textContent = 'Showing ' + order.length + ' of ' + rowCount + ' rows';
+        rows.style.height = (order.length * ROW_HEIGHT) + 'px';
+        render();
+    }
+
+    function render() {
+        var top = Math.max(0, viewport.scrollTop - header.offsetHeight);
+        var first = Math.max(0, Math.floor(top / ROW_HEIGHT) - OVERSCAN);
+        var last = Math.min(order.length, Math.ceil((top + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+        var columns = visibleColumns();
+        var template = rows.style.gridTemplateColumns;
+        var html = [];
+        for (var n = first; n < last; n++) {
+            var i = order[n];
+            html.push('<div class="row body-row" style="top:' + (n * ROW_HEIGHT) + 'px;grid-template-columns:' +
+                      template + '">');
+            for (var k = 0; k < columns.length; k++) {
+                var j = columns[k], code = codes[j][i];
+                var className = isPlatform[j] ? 'platform' : (headers[j] === 'Topic Name' ? 'feature-name' : '');
+                html.push('<div class="' + className + '" title="' + escapeHtml(values[j][code]) + '">' +
+                          formatCell(j, code) + '</div>');
+            }
+            html.push('</div>');
+        }
+        rows.innerHTML = html.join('');
+    }
+
+    function setup() {
+        filterColumn.innerHTML = '<option value="-1">Filter column...</option>' + headers.map(function (h, j) {
+            return '<option value="' + j + '">' + escapeHtml(h) + '</option>';
+        }).join('');
+        document.getElementById('platforms').innerHTML = 'Platforms: ' + data.platforms.map(function (j) {
+            return '<label><input type="checkbox" data-column="' + j + '" checked> ' + escapeHtml(headers[j]) + '</label>';
+        }).join('');
+        rows.style.position = 'relative';
+
+        document.getElementById('platforms').addEventListener('change', function (event) {
+            hidden[+event.target.dataset.column] = !event.target.checked;
+            layout();
+            applyFilters();
+        });
+        header.addEventListener('click', function (event) {
+            var column = +event.target.dataset.column;
+            if (isNaN(column)) {
+                return;
+            }
+            if (column !== sortColumn) {
+                sortColumn = column;
+                sortDirection = 1;
+            } else if (sortDirection > 0) {
+                sortDirection = -1;
+            } else {
+                sortColumn = -1;
+            }
+            layout();
+            applyFilters();
+        });
+        [search, filterColumn, filterValue].forEach(function (input) {
+            input.addEventListener('input', applyFilters);
+        });
+        var pending = false;
+        viewport.addEventListener('scroll', function () {
+            if (!pending) {
+                pending = true;
+                requestAnimationFrame(function () {
+                    pending = false;
+                    render();
+                });
+            }
+        });
+        window.addEventListener('resize', render);
+        layout();
+        applyFilters();
+    }
+
+    setup();
+})();
+    </script>
+</body>
+</html>
+"""
+VIEWER_PRINT_LINK = '<a href="{href}">Printable version</a>'
+
+def create_html_from_csv(csv_filename, html_filename, title="Video Platform Comparison", references=None,
+                         compression=None, checksums=False):
+    """Create HTML file from CSV data that can be converted to PDF"""
+    if not Path(csv_filename).exists():
+        print(f"CSV file not found: {csv_filename}")
+        return
     
-    # Write HTML file
-    with open(html_filename, 'w', encoding='utf-8') as htmlfile:
-        htmlfile.write(html_content)
+    # Stream rows from the memory-mapped CSV straight into the HTML writer; an empty
+    # CSV still writes an (empty) page, so no stale page is recorded as up to date
+    with open_csv_source(csv_filename) as source:
+        if not source.headers:
+            print(f"No data found in {csv_filename}")
+        
+        create_html_from_data(source.iter_data(), html_filename, title, references, compression, checksums)
+
+def format_html_cell(cell, references=None):
+    """Escape a cell, turning resolvable [Label][n] citations into links"""
+    if references is None or '][' not in cell:
+        return html.escape(cell, quote=False)
+    parts = []
+    for segment in references.split(cell):
+        if segment[0] == 'text':
+            parts.append(html.escape(segment[1], quote=False))
+        else:
+            _, label, url, title = segment
+            parts.append(HTML_LINK.format(url=html.escape(url), title=html.escape(title), label=html.escape(label, quote=False)))
+    return ''.join(parts)
+
+def write_html_row(htmlfile, row, references=None):
+    """Write one escaped table body row"""
+    parts = ["            <tr>\n"]
+    for j, cell in enumerate(row):
+        cell = format_html_cell(cell, references)
+        if j == 0:  # First column (feature name)
+            parts.append(HTML_FEATURE_CELL.format(cell))
+        elif j == 1:  # Second column (serial number)
+            parts.append(HTML_SERIAL_CELL.format(cell))
+        else:  # Platform columns
+            parts.append(HTML_PLATFORM_CELL.format(cell))
+    parts.append("            </tr>\n")
+    htmlfile.write(''.join(parts))
+
+def create_html_from_data(data, html_filename, title="Video Platform Comparison", references=None,
+                          compression=None, checksums=False):
+    """Create HTML file from an iterable of rows (header row first).
+
+    Rows are escaped and written to the file as they arrive, so the page is
+    never assembled in memory. With a ReferenceIndex, citations become links.
+    An empty iterable gives a page with an empty table.
+    """
+    rows = iter(data)
+    headers = next(rows, [])
+    
+    with stage('emit html', html_filename) as s, \
+            open_output(html_filename, compression) as htmlfile:
+        htmlfile.write(HTML_TABLE_HEAD.format(title=html.escape(title)))
+        
+        # Add headers
+        htmlfile.write(''.join(HTML_HEADER_CELL.format(html.escape(h, quote=False)) for h in headers))
+        htmlfile.write("            </tr>\n        </thead>\n        <tbody>\n")
+        
+        # Add data rows
+        for row in rows:
+            write_html_row(htmlfile, row, references)
+            s.rows += 1
+        
+        htmlfile.write(HTML_TABLE_FOOT)
     
     print(f"Created HTML: {html_filename}")
+    finish_output(html_filename, compression, checksums)
+
+def viewer_filename(html_filename):
+    """Return the interactive viewer file that sits next to a printable HTML file"""
+    path = Path(html_filename)
+    return str(path.with_name(f"{path.stem}_viewer{path.suffix}"))
+
+def viewer_payload(table, title, references=None):
+    """Return the compact JSON document embedded in a viewer page.
+    
+    Each column is stored dictionary-encoded as in ComparisonTable: its
+    distinct values once plus one small integer code per row. Only the
+    references actually cited by the table are included.
+    """
+    links = {}
+    if references is not None:
+        for column in table.columns:
+            for value in column.values:
+                for _, number in iter_citations(value):
+                    link = references.get(number)
+                    if link:
+                        links[str(number)] = list(link)
+    platforms = set(table.platforms)
+    return {
+        'title': title,
+        'headers': table.headers,
+        'platforms': [j for j, h in enumerate(table.headers) if h in platforms],
+        'values': [column.values for column in table.columns],
+        'codes': [column.codes.tolist() for column in table.columns],
+        'links': links
+    }
+
+def create_viewer_from_data(data, html_filename, title="Video Platform Comparison", references=None,
+                            print_filename=None, compression=None, checksums=False):
+    """Create an interactive HTML viewer from an iterable of rows (header row first).
+    
+    The page embeds the table once as compact JSON and renders only the rows
+    in view, so it stays responsive for tables far larger than the printable
+    HTML can hold. Rows can be searched, filtered by column, sorted by any
+    column, and platform columns can be hidden.
+    """
+    with stage('emit viewer', html_filename) as s:
+        table = ComparisonTable.from_data(data)
+        s.rows = len(table)
+        payload = json.dumps(viewer_payload(table, title, references), ensure_ascii=False, separators=(',', ':'))
+        print_link = VIEWER_PRINT_LINK.format(href=html.escape(print_filename)) if print_filename else ''
+        with open_output(html_filename, compression) as htmlfile:
+            htmlfile.write(VIEWER_HTML_HEAD.replace('{title}', html.escape(title)).replace('{print_link}', print_link))
+            htmlfile.write(payload.replace('<', '\\u003c'))  # keep the JSON from closing the script element
+            htmlfile.write(VIEWER_HTML_TAIL)
+    
+    print(f"Created viewer: {html_filename}")
+    finish_output(html_filename, compression, checksums)
 
-def create_summary_html():
+def create_viewer_from_csv(csv_filename, html_filename, title="Video Platform Comparison", references=None,
+                           print_filename=None, compression=None, checksums=False):
+    """Create an interactive HTML viewer from a CSV file"""
+    if not Path(csv_filename).exists():
+        print(f"CSV file not found: {csv_filename}")
+        return
+    
+    with open_csv_source(csv_filename) as source:
+        if not source.headers:
+            print(f"No data found in {csv_filename}")
+        
+        create_viewer_from_data(source.iter_data(), html_filename, title, references, print_filename,
+                                compression, checksums)
+
+def create_summary_html(summary=None, compression=None, checksums=False):
     """Create a summary HTML file"""
+    summary = summary or load_summary()
     html_content = """
 <!DOCTYPE html>
 <html>
@@ -168,14 +581,18 @@ def create_summary_html():
 <body>
     <h1>Video Platform Comparison Summary</h1>
     
-    <div class="summary-box">
+"""
+    
+    # Overview, platform list and file inventory come from the tables and outputs on disk
+    overview = "".join(f"            <li><strong>{html.escape(label)}:</strong> {count} features compared</li>\n"
+                       for label, count, _ in summary.categories)
+    platforms = "".join(f"                <li>{html.escape(platform)}</li>\n" for platform in summary.platforms)
+    html_content += f"""    <div class="summary-box">
         <h2>Overview</h2>
         <p>This document contains comprehensive comparisons of video calling platforms including:</p>
         <ul>
-            <li><strong>Technical Settings:</strong> 20 features analyzed</li>
-            <li><strong>UI/UX Features:</strong> 100 features compared</li>
-            <li><strong>Platform Coverage:</strong> 15 major platforms</li>
-            <li><strong>Additional Platforms:</strong> 40+ emerging and specialized platforms</li>
+{overview}            <li><strong>Platform Coverage:</strong> {len(summary.platforms)} major platforms</li>
+            <li><strong>Additional Platforms:</strong> {len(summary.additional_platforms)} emerging and specialized platforms</li>
         </ul>
     </div>
     
@@ -183,50 +600,23 @@ def create_summary_html():
         <h2>Platforms Compared</h2>
         <div class="platform-list">
             <ul>
-                <li>Jitsi Meet</li>
-                <li>Google Meet</li>
-                <li>Zoom</li>
-                <li>Microsoft Teams</li>
-                <li>Cisco Webex</li>
-                <li>Discord</li>
-                <li>Slack</li>
-                <li>BlueJeans</li>
-                <li>RingCentral</li>
-                <li>8x8</li>
-                <li>Whereby</li>
-                <li>Loom</li>
-            </ul>
+{platforms}            </ul>
         </div>
     </div>
     
     <div class="file-list">
         <h2>Generated Files</h2>
         <ul>
-            <li><strong>CSV Files:</strong>
-                <ul>
-                    <li>video_platform_comparison_table_1.csv - Technical Settings</li>
-                    <li>video_platform_comparison_table_2.csv - UI/UX Features</li>
-                    <li>video_platform_comparison_practical_table_1.csv - Technical Settings (Practical)</li>
-                    <li>video_platform_comparison_practical_table_2.csv - UI/UX Features (Practical)</li>
-                </ul>
-            </li>
-            <li><strong>HTML Files:</strong>
-                <ul>
-                    <li>technical_comparison.html - Technical Settings Comparison</li>
-                    <li>uiux_comparison.html - UI/UX Features Comparison</li>
-                    <li>technical_comparison_practical.html - Technical Settings (Practical)</li>
-                    <li>uiux_comparison_practical.html - UI/UX Features (Practical)</li>
-                </ul>
-            </li>
-            <li><strong>JSON Files:</strong>
+"""
+    for file_type in summary.file_types():
+        files = "".join(f"                    <li>{html.escape(filename)} - {html.escape(description)}</li>\n"
+                        for filename, description in summary.files_of_type(file_type))
+        html_content += f"""            <li><strong>{html.escape(file_type)} Files:</strong>
                 <ul>
-                    <li>video_platform_comparison_table_1.json - Technical Settings (JSON format)</li>
-                    <li>video_platform_comparison_table_2.json - UI/UX Features (JSON format)</li>
-                    <li>video_platform_comparison_practical_table_1.json - Technical Settings (Practical, JSON)</li>
-                    <li>video_platform_comparison_practical_table_2.json - UI/UX Features (Practical, JSON)</li>
-                </ul>
+{files}                </ul>
             </li>
-        </ul>
+"""
+    html_content += """        </ul>
     </div>
     
     <div class="summary-box">
@@ -241,26 +631,98 @@ def create_summary_html():
 </html>
 """
     
-    with open("video_platform_comparison_summary.html", 'w', encoding='utf-8') as htmlfile:
+    with stage('emit html', "video_platform_comparison_summary.html"), \
+            open_output("video_platform_comparison_summary.html", compression) as htmlfile:
         htmlfile.write(html_content)
     
     print("Created HTML: video_platform_comparison_summary.html")
+    finish_output("video_platform_comparison_summary.html", compression, checksums)
 
-def main():
+def main(force=False, jobs=1, compression=None, checksums=False, viewer=False):
     # Create HTML files from CSV files
     csv_files = [
-        ("video_platform_comparison_table_1.csv", "technical_comparison.html", "Technical Settings Comparison"),
-        ("video_platform_comparison_table_2.csv", "uiux_comparison.html", "UI/UX Features Comparison"),
-        ("video_platform_comparison_practical_table_1.csv", "technical_comparison_practical.html", "Technical Settings Comparison (Practical)"),
-        ("video_platform_comparison_practical_table_2.csv", "uiux_comparison_practical.html", "UI/UX Features Comparison (Practical)")
+        ("video_platform_comparison_table_1.csv", "technical_comparison.html", "Technical Settings Comparison", "video_platform_comparison.md"),
+        ("video_platform_comparison_table_2.csv", "uiux_comparison.html", "UI/UX Features Comparison", "video_platform_comparison.md"),
+        ("video_platform_comparison_practical_table_1.csv", "technical_comparison_practical.html", "Technical Settings Comparison (Practical)", "video_platform_comparison_practical.md"),
+        ("video_platform_comparison_practical_table_2.csv", "uiux_comparison_practical.html", "UI/UX Features Comparison (Practical)", "video_platform_comparison_practical.md")
     ]
     
-    for csv_file, html_file, title in csv_files:
+    manifest = BuildManifest()
+    script_hash = hash_modules(GENERATOR_MODULES)
+    
+    # Citations are resolved against the References section of each source
+    references = {}
+    for markdown_file in dict.fromkeys(f[3] for f in csv_files):
+        if Path(markdown_file).exists():
+            references[markdown_file] = read_references(markdown_file)
+    
+    # Collect the outputs that need rebuilding
+    tasks = []
+    for csv_file, html_file, title, markdown_file in csv_files:
         if Path(csv_file).exists():
-            create_html_from_csv(csv_file, html_file, title)
+            reference_index = references.get(markdown_file)
+            inputs = {'script': script_hash, 'source': hash_file(csv_file), 'title': title,
+                      'references': reference_index.digest() if reference_index else None,
+                      'compression': compression, 'checksums': checksums}
+            if not force and manifest.is_up_to_date(html_file, inputs, output_variants(html_file, compression, checksums)):
+                print(f"Up to date: {html_file}")
+                continue
+            tasks.append((html_file, inputs, create_html_from_csv,
+                          (csv_file, html_file, title, reference_index, compression, checksums)))
+    
+    # Optionally create the interactive viewers next to the printable pages
+    for csv_file, html_file, title, markdown_file in csv_files if viewer else []:
+        if Path(csv_file).exists():
+            reference_index = references.get(markdown_file)
+            viewer_file = viewer_filename(html_file)
+            inputs = {'script': script_hash, 'source': hash_file(csv_file), 'title': title,
+                      'references': reference_index.digest() if reference_index else None,
+                      'compression': compression, 'checksums': checksums}
+            if not force and manifest.is_up_to_date(viewer_file, inputs, output_variants(viewer_file, compression, checksums)):
+                print(f"Up to date: {viewer_file}")
+                continue
+            tasks.append((viewer_file, inputs, create_viewer_from_csv,
+                          (csv_file, viewer_file, title, reference_index, Path(html_file).name, compression, checksums)))
+    
+    # Render, possibly in parallel, and record results in a fixed order
+    errors = run_tasks([(func, args) for _, _, func, args in tasks], jobs)
+    failures = 0
+    for (output_file, inputs, _, _), error in zip(tasks, errors):
+        if error:
+            failures += 1
+            print(f"Failed: {output_file}: {error}")
+        else:
+            manifest.record(output_file, inputs, output_variants(output_file, compression, checksums))
+    
+    # Create summary HTML once the tables are written, so it lists what is on disk
+    summary_file = "video_platform_comparison_summary.html"
+    summary = load_summary()
+    inputs = {'script': script_hash, 'summary': summary.digest(), 'compression': compression, 'checksums': checksums}
+    if not force and manifest.is_up_to_date(summary_file, inputs, output_variants(summary_file, compression, checksums)):
+        print(f"Up to date: {summary_file}")
+    else:
+        create_summary_html(summary, compression, checksums)
+        manifest.record(summary_file, inputs, output_variants(summary_file, compression, checksums))
     
-    # Create summary HTML
-    create_summary_html()
+    manifest.save()
+    return failures
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--force', action='store_true', help='rebuild every output even if unchanged')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='render up to N documents in parallel (0 = one per CPU)')
+    parser.add_argument('--viewer', action='store_true',
+                        help='also write <name>_viewer.html, an interactive page that renders only the visible rows')
+    add_output_arguments(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    check_compression(parser, args.compress)
+    if args.profile:
+        PROFILER.enable()
+    jobs = args.jobs if args.jobs > 0 else default_jobs()
+    failures = main(force=args.force, jobs=jobs, compression=args.compress, checksums=args.checksums,
+                    viewer=args.viewer)
+    report_profile(args.profile)
+    if failures:
+        raise SystemExit(1)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Open generator outputs with optional compressed copies and checksum files
+"""
+
+import gzip
+import importlib.util
+import io
+from contextlib import contextmanager
+from pathlib import Path
+
+from build_manifest import hash_file
+
+COMPRESSION_EXTENSIONS = {
+    'gzip': '.gz',
+    'zstd': '.zst'
+}
+COMPRESSION_LEVELS = {
+    'gzip': 9,
+    'zstd': 19
+}
+CHECKSUM_EXTENSION = '.sha256'
+
+def compression_available(compression):
+    """Return True if the compressor can be used (zstd needs the zstandard package)"""
+    if compression == 'zstd':
+        return importlib.util.find_spec('zstandard') is not None
+    return compression in COMPRESSION_EXTENSIONS
+
+def compressed_filename(filename, compression):
+    return f"{filename}{COMPRESSION_EXTENSIONS[compression]}"
+
+def output_variants(filename, compression=None, checksums=False):
+    """Return every file written for one output: itself, its compressed copy and checksums"""
+    files = [str(filename)]
+    if compression:
+        files.append(compressed_filename(filename, compression))
+    if checksums:
+        files += [f"{f}{CHECKSUM_EXTENSION}" for f in list(files)]
+    return files
+
+def _open_compressed(filename, compression, newline):
+    """Open a text stream that compresses into filename as it is written"""
+    raw = open(filename, 'wb')
+    if compression == 'gzip':
+        # A fixed mtime and no stored name keep the bytes reproducible
+        binary = gzip.GzipFile(filename='', mode='wb', fileobj=raw, mtime=0,
+                               compresslevel=COMPRESSION_LEVELS['gzip'])
+        stream = io.TextIOWrapper(binary, encoding='utf-8', newline=newline)
+        stream.raw_file = raw  # GzipFile does not close a fileobj it was given
+        return stream
+    import zstandard
+    binary = zstandard.ZstdCompressor(level=COMPRESSION_LEVELS['zstd']).stream_writer(raw)
+    return io.TextIOWrapper(binary, encoding='utf-8', newline=newline)
+
+class TeeWriter:
+    """Write the same text to several streams"""
+    
+    def __init__(self, streams):
+        self.streams = streams
+    
+    def write(self, text):
+        for stream in self.streams:
+            stream.write(text)
+        return len(text)
+
+@contextmanager
+def open_output(filename, compression=None, newline=None):
+    """Open a text output, also streaming a compressed copy when compression is set.
+    
+    The plain file is always written, so readers of the existing outputs are
+    unaffected; the compressed copy (e.g. uiux_comparison.html.gz) is
+    produced in the same pass rather than by compressing the file later.
+    """
+    streams = [open(filename, 'w', encoding='utf-8', newline=newline)]
+    try:
+        if compression:
+            streams.append(_open_compressed(compressed_filename(filename, compression), compression, newline))
+        yield streams[0] if len(streams) == 1 else TeeWriter(streams)
+    finally:
+        for stream in streams:
+            stream.close()
+            raw_file = getattr(stream, 'raw_file', None)
+            if raw_file is not None:
+                raw_file.close()
+
+def finish_output(filename, compression=None, checksums=False):
+    """Report the compressed copy and write SHA-256 checksum files after an output is closed.
+    
+    Each checksum file holds one line in sha256sum format, so an upload step
+    can compare it with the stored object and skip unchanged files.
+    """
+    files = [str(filename)]
+    if compression:
+        files.append(compressed_filename(filename, compression))
+        print(f"Created {compression}: {files[-1]}")
+    if checksums:
+        for f in files:
+            with open(f"{f}{CHECKSUM_EXTENSION}", 'w', encoding='utf-8') as checksum_file:
+                checksum_file.write(f"{hash_file(f)}  {Path(f).name}\n")
+        print(f"Created checksums: {', '.join(f + CHECKSUM_EXTENSION for f in files)}")
+
+def add_output_arguments(parser):
+    """Add the standard --compress and --checksums options to a generator's argument parser"""
+    parser.add_argument('--compress', choices=sorted(COMPRESSION_EXTENSIONS),
+                        help='also write a compressed copy of every output (.gz or .zst)')
+    parser.add_argument('--checksums', action='store_true',
+                        help='write a .sha256 file next to every output')
+
+def check_compression(parser, compression):
+    """Stop with a usage error if the requested compressor is not installed"""
+    if compression and not compression_available(compression):
+        parser.error(f"{compression} compression needs the zstandard package")
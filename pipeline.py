@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Generate every comparison output in one process from a single markdown parse
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from build_manifest import BuildManifest, hash_modules
+from comparison_table import ComparisonTable
+from create_excel_like import create_formatted_csv_from_data, create_summary_csv, create_readme
+from generate_excel import create_outputs_from_table, hash_markdown_tables, iter_markdown_file, read_section_table
+from generate_pdf import create_pdf_from_data, create_summary_pdf, reportlab_available
+from generate_simple_pdf import create_html_from_data, create_summary_html
+from profiling import PROFILER, add_profile_argument, report_profile, stage
+from references import ReferenceIndex
+from section_index import SectionIndex
+from summary_data import load_summary
+
+GENERATOR_MODULES = [
+    'pipeline.py',
+    'generate_excel.py',
+    'create_excel_like.py',
+    'generate_simple_pdf.py',
+    'generate_pdf.py',
+    'comparison_table.py',
+    'csv_source.py',
+    'output_files.py',
+    'references.py',
+    'section_index.py',
+    'summary_data.py'
+]
+
+# (markdown file, table number, output stem, title)
+REPORTS = [
+    ('video_platform_comparison.md', 1, 'technical_comparison', 'Technical Settings Comparison'),
+    ('video_platform_comparison.md', 2, 'uiux_comparison', 'UI/UX Features Comparison'),
+    ('video_platform_comparison_practical.md', 1, 'technical_comparison_practical', 'Technical Settings Comparison (Practical)'),
+    ('video_platform_comparison_practical.md', 2, 'uiux_comparison_practical', 'UI/UX Features Comparison (Practical)')
+]
+
+def generators_hash():
+    """Return one hash covering the code of every generator module"""
+    return hash_modules(GENERATOR_MODULES)
+
+def report_outputs(base_name, number, stem, with_pdf):
+    """Return the list of files produced for one table"""
+    outputs = [
+        f"{base_name}_table_{number}.csv",
+        f"{base_name}_table_{number}.json"
+    ]
+    if stem:
+        outputs.append(f"{stem}_formatted.csv")
+        outputs.append(f"{stem}.html")
+        if with_pdf:
+            outputs.append(f"{stem}.pdf")
+    return outputs
+
+def report_inputs(script_hash, table_hash, references, title, with_pdf):
+    """Return the manifest inputs of one table's outputs"""
+    return {'script': script_hash, 'source': table_hash, 'references': references.digest(),
+            'title': title, 'pdf': with_pdf}
+
+def emit_table(table, base_name, number, stem, title, with_pdf, references=None):
+    """Hand one parsed ComparisonTable to every emitter without touching the disk in between"""
+    create_outputs_from_table(
+        {'headers': table.headers, 'data': table.iter_rows()},
+        f"{base_name}_table_{number}.csv",
+        f"{base_name}_table_{number}.json"
+    )
+    if not stem:
+        return
+    
+    create_formatted_csv_from_data(table.iter_data(), f"{stem}_formatted.csv", title)
+    create_html_from_data(table.iter_data(), f"{stem}.html", title, references)
+    if with_pdf:
+        create_pdf_from_data(table, f"{stem}.pdf", title, references=references)
+
+def main(force=False, with_pdf=True):
+    if with_pdf and not reportlab_available():
+        print("reportlab is not installed; skipping PDF output")
+        with_pdf = False
+    
+    reports = {}
+    for markdown_file, number, stem, title in REPORTS:
+        reports[(markdown_file, number)] = (stem, title)
+    markdown_files = list(dict.fromkeys(r[0] for r in REPORTS))
+    
+    manifest = BuildManifest()
+    script_hash = generators_hash()
+    
+    for filename in markdown_files:
+        if not Path(filename).exists():
+            print(f"File not found: {filename}")
+            continue
+        
+        print(f"\nProcessing: {filename}")
+        
+        base_name = Path(filename).stem
+        references = ReferenceIndex()
+        with stage('hash tables', filename):
+            table_hashes = hash_markdown_tables(filename, references)
+        
+        for i, table in enumerate(iter_markdown_file(filename)):
+            if not table:
+                continue
+            number = i + 1
+            stem, title = reports.get((filename, number), (None, None))
+            key = f"pipeline:{filename}#{number}"
+            inputs = report_inputs(script_hash, table_hashes[i], references, title, with_pdf)
+            outputs = report_outputs(base_name, number, stem, with_pdf)
+            if not force and manifest.is_up_to_date(key, inputs, outputs):
+                print(f"Up to date: {', '.join(outputs)}")
+                continue
+            with stage('parse table', filename) as s:
+                table = ComparisonTable.from_rows(table['headers'], table['data'])
+                s.rows = len(table)
+            emit_table(table, base_name, number, stem, title, with_pdf, references)
+            manifest.record(key, inputs, outputs)
+    
+    write_summaries(manifest, script_hash, with_pdf, force)
+    manifest.save()
+
+def write_summaries(manifest, script_hash, with_pdf, force=False):
+    """Write the README and the summary CSV, HTML and PDF from one shared aggregation"""
+    summary = load_summary()
+    summaries = [
+        ("video_platform_comparison_summary.csv", create_summary_csv, (summary,)),
+        ("README.md", create_readme, (summary,)),
+        ("video_platform_comparison_summary.html", create_summary_html, (summary,))
+    ]
+    if with_pdf:
+        summaries.append(("video_platform_comparison_summary.pdf", create_summary_pdf, (summary,)))
+    
+    for output_file, create, args in summaries:
+        key = f"pipeline:{output_file}"
+        inputs = {'script': script_hash, 'summary': summary.digest()}
+        if not force and manifest.is_up_to_date(key, inputs, [output_file]):
+            print(f"Up to date: {output_file}")
+            continue
+        create(*args)
+        manifest.record(key, inputs, [output_file])
+
+def load_tables(filename):
+    """Parse every table of a markdown file into a {number: ComparisonTable} dict"""
+    tables = {}
+    for i, table in enumerate(iter_markdown_file(filename)):
+        if table:
+            tables[i + 1] = ComparisonTable.from_rows(table['headers'], table['data'])
+    return tables
+
+def changed_rows(old, new):
+    """Return the indices of rows that differ between two parses of a table.
+    
+    Rows are compared by position; rows only present in the longer table
+    count as changed. Returns None when there is no old table or the
+    headers differ, since then every row is new.
+    """
+    if old is None or old.headers != new.headers:
+        return None
+    common = min(len(old), len(new))
+    changes = [i for i in range(common) if old.row(i) != new.row(i)]
+    changes.extend(range(common, max(len(old), len(new))))
+    return changes
+
+def source_signature(filename):
+    """Return a cheap (mtime, size) fingerprint of a file, or None if it is missing"""
+    try:
+        st = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def load_section_tables(index, numbers):
+    """Parse only the given tables of an indexed file into a {number: ComparisonTable} dict.
+    
+    Each table is read by seeking to its section; tables outside any
+    section fall back to one streaming parse of the whole file.
+    """
+    tables = {}
+    fallback = None
+    for number in numbers:
+        section = index.table_section(number)
+        if section is not None:
+            table = read_section_table(index, section, number)
+            if table:
+                tables[number] = ComparisonTable.from_rows(table['headers'], table['data'])
+        else:
+            if fallback is None:
+                fallback = load_tables(index.filename)
+            if number in fallback:
+                tables[number] = fallback[number]
+    return tables
+
+def refresh_file(filename, cached, reports, script_hash, with_pdf):
+    """Re-parse the changed sections of a markdown file and re-emit only the tables that changed.
+    
+    cached holds the previous 'tables', 'table_hashes' and 'references' of
+    the file and is updated in place. One pass indexes the sections and
+    hashes every table; only tables whose hash moved are parsed, from their
+    own byte range. A change to the References section re-emits every
+    table, since citation links may have moved. The manifest is updated so
+    a later non-watch run sees the fresh outputs as up to date.
+    """
+    start = time.perf_counter()
+    references = ReferenceIndex()
+    with stage('index sections', filename):
+        index = SectionIndex(filename, references)
+    table_hashes = index.table_hashes
+    references_changed = references.digest() != cached['references']
+    stale = [number for number in range(1, len(table_hashes) + 1)
+             if references_changed or cached['table_hashes'].get(number) != table_hashes[number - 1]]
+    with stage('parse tables', filename):
+        parsed = load_section_tables(index, stale)
+    base_name = Path(filename).stem
+    manifest = BuildManifest()
+    
+    refreshed = 0
+    for number, table in parsed.items():
+        changes = changed_rows(cached['tables'].get(number), table)
+        if changes == [] and not references_changed:
+            continue
+        if changes == []:
+            print(f"Table {number}: references changed")
+        elif changes is None:
+            print(f"Table {number}: new or restructured, {len(table)} rows")
+        else:
+            print(f"Table {number}: {len(changes)} changed rows")
+        stem, title = reports.get((filename, number), (None, None))
+        emit_table(table, base_name, number, stem, title, with_pdf, references)
+        manifest.record(
+            f"pipeline:{filename}#{number}",
+            report_inputs(script_hash, table_hashes[number - 1], references, title, with_pdf),
+            report_outputs(base_name, number, stem, with_pdf)
+        )
+        refreshed += 1
+    
+    tables = {n: t for n, t in cached['tables'].items() if n <= len(table_hashes)}
+    tables.update(parsed)
+    for number in cached['tables'].keys() - tables.keys():
+        print(f"Table {number}: removed; its old outputs are left in place")
+    
+    manifest.save()
+    cached['tables'] = tables
+    cached['table_hashes'] = dict(enumerate(table_hashes, 1))
+    cached['references'] = references.digest()
+    if refreshed:
+        print(f"Refreshed {refreshed} table(s) from {filename} in {time.perf_counter() - start:.3f}s")
+    else:
+        print(f"No table changes in {filename}")
+
+def watch(with_pdf=True, interval=0.2, force=False):
+    """Build once, then keep the parsed tables in memory and rebuild on change.
+    
+    The markdown sources are polled every interval seconds. On a change the
+    file's sections are re-indexed, the tables whose sections changed are
+    parsed again and compared with the cached tables row by row; only
+    tables with differences are re-emitted, followed by any summary file
+    whose aggregates changed. A failed rebuild is reported and retried on
+    the next change instead of stopping the watcher.
+    """
+    main(force=force, with_pdf=with_pdf)
+    with_pdf = with_pdf and reportlab_available()
+    
+    reports = {}
+    for markdown_file, number, stem, title in REPORTS:
+        reports[(markdown_file, number)] = (stem, title)
+    markdown_files = list(dict.fromkeys(r[0] for r in REPORTS))
+    script_hash = generators_hash()
+    
+    cache = {}
+    signatures = {}
+    failed = {}
+    for filename in markdown_files:
+        signatures[filename] = source_signature(filename)
+        cache[filename] = {'tables': {}, 'table_hashes': {}, 'references': None}
+        if signatures[filename]:
+            try:
+                references = ReferenceIndex()
+                index = SectionIndex(filename, references)
+                cache[filename]['tables'] = load_section_tables(index, range(1, len(index.table_hashes) + 1))
+                cache[filename]['table_hashes'] = dict(enumerate(index.table_hashes, 1))
+                cache[filename]['references'] = references.digest()
+            except Exception as e:
+                # Start from an empty cache; the first successful refresh re-emits everything
+                print(f"Failed: {filename}: {e}")
+                signatures[filename] = None
+    
+    print(f"\nWatching {', '.join(markdown_files)} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(interval)
+            for filename in markdown_files:
+                signature = source_signature(filename)
+                if signature is None or signature in (signatures[filename], failed.get(filename)):
+                    continue
+                print(f"\nChanged: {filename}")
+                try:
+                    refresh_file(filename, cache[filename], reports, script_hash, with_pdf)
+                    manifest = BuildManifest()
+                    write_summaries(manifest, script_hash, with_pdf)
+                    manifest.save()
+                except Exception as e:
+                    # Keep the old signature so the next save is retried, but not this one again
+                    print(f"Failed: {filename}: {e}")
+                    failed[filename] = signature
+                    continue
+                signatures[filename] = signature
+                failed.pop(filename, None)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--force', action='store_true', help='rebuild every output even if unchanged')
+    parser.add_argument('--no-pdf', action='store_true', help='skip ReportLab PDF output')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and rebuild the tables that change in the markdown sources')
+    parser.add_argument('--interval', type=float, default=0.2, help='seconds between checks in --watch mode')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    if args.profile:
+        PROFILER.enable()
+    if args.watch:
+        watch(with_pdf=not args.no_pdf, interval=args.interval, force=args.force)
+    else:
+        main(force=args.force, with_pdf=not args.no_pdf)
+    report_profile(args.profile)
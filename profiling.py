@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Lightweight stage instrumentation for the comparison generators
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+class StageRecord:
+    """Timing and throughput of one instrumented stage"""
+    
+    __slots__ = ('name', 'files', 'rows', 'start_us', 'wall_s', 'cpu_s', 'peak_bytes', 'max_rss_kb', 'bytes', 'pid')
+    
+    def __init__(self, name, files):
+        self.name = name
+        self.files = [str(f) for f in files]
+        self.rows = 0
+        self.start_us = 0
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.peak_bytes = 0
+        self.max_rss_kb = 0
+        self.bytes = 0
+        self.pid = os.getpid()
+    
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class Profiler:
+    """Collect StageRecords for the stages run while it is enabled.
+    
+    When disabled, stage() only hands back a throwaway record, so the
+    instrumentation can stay in place at no measurable cost.
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.records = []
+        self._stack = []
+    
+    def enable(self, trace_memory=True):
+        self.enabled = True
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+    
+    @contextmanager
+    def stage(self, name, *files):
+        """Measure the enclosed block; set .rows on the yielded record"""
+        record = StageRecord(name, files)
+        if not self.enabled:
+            yield record
+            return
+        
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            # Fold the parent's peak so far in before resetting it for this stage
+            if self._stack:
+                parent = self._stack[-1]
+                parent.peak_bytes = max(parent.peak_bytes, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._stack.append(record)
+        
+        wall_start = time.perf_counter_ns()
+        cpu_start = time.process_time()
+        record.start_us = wall_start // 1000
+        try:
+            yield record
+        finally:
+            record.cpu_s = time.process_time() - cpu_start
+            record.wall_s = (time.perf_counter_ns() - wall_start) / 1e9
+            self._stack.pop()
+            if tracing:
+                record.peak_bytes = max(record.peak_bytes, tracemalloc.get_traced_memory()[1])
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent.peak_bytes = max(parent.peak_bytes, record.peak_bytes)
+                tracemalloc.reset_peak()
+            if resource is not None:
+                record.max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            record.bytes = sum(Path(f).stat().st_size for f in record.files if Path(f).exists())
+            self.records.append(record)
+    
+    def take_records(self):
+        """Return and clear the collected records (used to ship them from workers)"""
+        records, self.records = self.records, []
+        return [record.as_dict() for record in records]
+    
+    def add_records(self, records):
+        """Merge records collected in another process"""
+        for data in records:
+            record = StageRecord(data['name'], data['files'])
+            for name in StageRecord.__slots__:
+                setattr(record, name, data[name])
+            self.records.append(record)
+    
+    def print_summary(self):
+        print(f"\n{'Stage':<22}{'File':<48}{'Wall (s)':>10}{'CPU (s)':>10}{'Peak MB':>9}{'RSS MB':>8}{'Rows':>8}{'KB':>9}")
+        for r in self.records:
+            files = ', '.join(r.files) or '-'
+            print(f"{r.name:<22}{files[:47]:<48}{r.wall_s:>10.4f}{r.cpu_s:>10.4f}{r.peak_bytes / 1e6:>9.2f}"
+                  f"{r.max_rss_kb / 1024:>8.1f}{r.rows:>8}{r.bytes / 1024:>9.1f}")
+    
+    def write_chrome_trace(self, filename):
+        """Write the records as Chrome trace events (chrome://tracing, Perfetto)"""
+        events = []
+        for r in self.records:
+            events.append({
+                'name': r.name,
+                'cat': 'stage',
+                'ph': 'X',
+                'ts': r.start_us,
+                'dur': int(r.wall_s * 1e6),
+                'pid': r.pid,
+                'tid': r.pid,
+                'args': {
+                    'files': r.files,
+                    'rows': r.rows,
+                    'bytes': r.bytes,
+                    'cpu_s': r.cpu_s,
+                    'peak_bytes': r.peak_bytes,
+                    'max_rss_kb': r.max_rss_kb
+                }
+            })
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, indent=1)
+        print(f"Created trace: {filename}")
+
+PROFILER = Profiler()
+
+def stage(name, *files):
+    """Instrument a block with the shared profiler"""
+    return PROFILER.stage(name, *files)
+
+def add_profile_argument(parser):
+    """Add the standard --profile option to a generator's argument parser"""
+    parser.add_argument('--profile', nargs='?', const='profile_trace.json', metavar='TRACE',
+                        help='print per-stage timings and write a Chrome trace (default: profile_trace.json)')
+
+def report_profile(trace_filename):
+    """Print the summary table and write the trace if profiling was requested"""
+    if trace_filename and PROFILER.enabled:
+        PROFILER.print_summary()
+        PROFILER.write_chrome_trace(trace_filename)
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Serve the comparison tables over local HTTP with precomputed JSON responses and ETags
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from generate_excel import read_comparison_tables
+from section_index import SectionIndex
+
+DEFAULT_SOURCES = [
+    'video_platform_comparison.md',
+    'video_platform_comparison_practical.md'
+]
+MAX_PAGE_SIZE = 1000
+VIEW_CACHE_SIZE = 1024
+MAX_HEADER_BYTES = 16384
+
+STATUS_TEXT = {
+    200: 'OK',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed'
+}
+
+class Response:
+    """A serialized JSON body with its strong ETag and response head.
+    
+    Responses are built once and then written as-is for every request, so
+    serving one costs a dictionary lookup and a socket write.
+    """
+    
+    __slots__ = ('status', 'body', 'etag', 'head', 'not_modified')
+    
+    def __init__(self, data, status=200):
+        self.status = status
+        self.body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self.head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(self.body)}\r\n"
+            f"ETag: {self.etag}\r\n"
+            f"Cache-Control: no-cache\r\n"
+        ).encode('ascii')
+        self.not_modified = (
+            f"HTTP/1.1 304 Not Modified\r\n"
+            f"ETag: {self.etag}\r\n"
+            f"Cache-Control: no-cache\r\n"
+        ).encode('ascii')
+
+def error_response(status, message):
+    return Response({'error': message}, status)
+
+def etag_matches(if_none_match, etag):
+    """Return True if an If-None-Match header value matches the ETag (weak comparison, as RFC 9110 asks)"""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+def source_signature(filename):
+    """Return a cheap (mtime, size) fingerprint of a file, or None if it is missing"""
+    try:
+        st = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def source_bases(sources):
+    """Map each source to its name in URLs: its path below the sources' common folder, without suffix.
+    
+    Sources in one folder keep their plain stem; 'us/comparison.md' and
+    'eu/comparison.md' become 'us/comparison' and 'eu/comparison'.
+    """
+    if not sources:
+        return {}
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in sources])
+    return {f: Path(os.path.relpath(os.path.abspath(f), root)).with_suffix('').as_posix() for f in sources}
+
+def table_path(base, number):
+    return f"/tables/{quote(base, safe='')}/{number}"
+
+def row_object(headers, row):
+    return dict(zip(headers, row))
+
+class Snapshot:
+    """The parsed tables and responses of one load of the sources.
+    
+    A snapshot is never changed after it is built, except for its view
+    cache, which only the event loop thread touches.
+    """
+    
+    __slots__ = ('signatures', 'tables', 'aliases', 'responses', 'views')
+    
+    def __init__(self, signatures, tables, aliases, responses):
+        self.signatures = signatures
+        self.tables = tables
+        self.aliases = aliases
+        self.responses = responses
+        self.views = OrderedDict()
+
+class ComparisonStore:
+    """The current Snapshot of the sources, replaced by one assignment on reload.
+    
+    Table listings, whole tables, single features and single platform
+    columns are serialized when a snapshot is built. Filtered and
+    paginated views are serialized on first use and kept in a bounded LRU
+    cache that is dropped with the snapshot it came from.
+    """
+    
+    def __init__(self, sources):
+        self.sources = sources
+        self.snapshot = Snapshot({}, {}, {}, {})
+    
+    def load(self):
+        """Build a snapshot and make it current; returns the number of tables"""
+        self.snapshot = self.build()
+        return len(self.snapshot.tables)
+    
+    def build(self):
+        """Parse the sources and build every response into a new Snapshot.
+        
+        Nothing shared is modified, so this can run in a worker thread
+        while the current snapshot keeps serving.
+        """
+        signatures = {filename: source_signature(filename) for filename in self.sources}
+        bases = source_bases(self.sources)
+        tables = {}
+        aliases = {}
+        for filename in self.sources:
+            if signatures[filename] is None:
+                continue
+            base = bases[filename]
+            index = SectionIndex(filename)
+            for i, table in enumerate(read_comparison_tables(filename)):
+                if not table:
+                    continue
+                number = i + 1
+                section = index.table_section(number)
+                tables[(base, number)] = (filename, section.title if section else None, table)
+                aliases[(base, str(number))] = number
+                if section is not None and section.tables[0] == number:
+                    aliases[(base, section.slug)] = number
+        
+        responses = {}
+        listing = []
+        for (base, number), (filename, section, table) in tables.items():
+            path = table_path(base, number)
+            listing.append({
+                'source': filename,
+                'number': number,
+                'section': section,
+                'rows': len(table),
+                'platforms': table.platforms,
+                'url': path
+            })
+            responses[path] = Response(self.table_page(number, filename, section, table, None, None, None,
+                                                  0, len(table)))
+            ser_column = table.column('Ser') if 'Ser' in table.headers else None
+            for i in range(len(table)):
+                ser = ser_column[i] if ser_column is not None else str(i + 1)
+                responses[f"{path}/features/{quote(ser)}"] = Response({
+                    'source': filename,
+                    'number': number,
+                    'feature': row_object(table.headers, table.row(i))
+                })
+            for platform in table.platforms:
+                responses[f"{path}/platforms/{quote(platform)}"] = Response(
+                    self.platform_view(filename, number, table, platform))
+        responses['/tables'] = Response({'tables': listing})
+        responses['/'] = responses['/tables']
+        return Snapshot(signatures, tables, aliases, responses)
+    
+    def changed(self):
+        signatures = self.snapshot.signatures
+        return any(source_signature(f) != signatures.get(f) for f in self.sources)
+    
+    @staticmethod
+    def platform_view(filename, number, table, platform):
+        column = table.platform(platform)
+        keys = [h for h in ('Ser', 'Topic Name') if h in table.headers]
+        key_columns = [table.column(h) for h in keys]
+        features = []
+        for i, value in enumerate(column):
+            feature = {h: c[i] for h, c in zip(keys, key_columns)}
+            feature['value'] = value
+            features.append(feature)
+        return {'source': filename, 'number': number, 'platform': platform, 'features': features}
+    
+    @staticmethod
+    def table_page(number, filename, section, table, platforms, query, category, offset, limit):
+        """Return one page of a table, optionally limited to some platforms and matching rows"""
+        headers = table.headers
+        if platforms:
+            headers = [h for h in headers if h not in table.platforms or h in platforms]
+        positions = [table.headers.index(h) for h in headers]
+        
+        matches = range(len(table))
+        if query or category:
+            topics = table.column('Topic Name') if 'Topic Name' in table.headers else None
+            categories = table.column('Category') if 'Category' in table.headers else None
+            query = query.lower() if query else None
+            matches = [
+                i for i in matches
+                if (not query or (topics is not None and query in topics[i].lower()))
+                and (not category or (categories is not None and categories[i] == category))
+            ]
+        
+        page = matches[offset:offset + limit]
+        rows = []
+        for i in page:
+            row = table.row(i)
+            rows.append({h: row[p] for h, p in zip(headers, positions)})
+        next_offset = offset + limit
+        return {
+            'source': filename,
+            'number': number,
+            'section': section,
+            'headers': headers,
+            'total': len(matches),
+            'offset': offset,
+            'limit': limit,
+            'next': next_offset if next_offset < len(matches) else None,
+            'rows': rows
+        }
+    
+    def view(self, snapshot, base, number, params):
+        """Return the Response for a filtered or paginated table, serializing it once"""
+        filename, section, table = snapshot.tables[(base, number)]
+        try:
+            offset = int(params.get('offset', ['0'])[0])
+            limit = int(params.get('limit', [str(MAX_PAGE_SIZE)])[0])
+        except ValueError:
+            return error_response(400, 'offset and limit must be integers')
+        if offset < 0 or not 0 < limit <= MAX_PAGE_SIZE:
+            return error_response(400, f"offset must be >= 0 and limit between 1 and {MAX_PAGE_SIZE}")
+        platforms = tuple(sorted(set(params.get('platform', []))))
+        unknown = [p for p in platforms if p not in table.platforms]
+        if unknown:
+            return error_response(404, f"unknown platform: {', '.join(unknown)}")
+        query = params.get('q', [''])[0]
+        category = params.get('category', [''])[0]
+        
+        key = (base, number, platforms, query, category, offset, limit)
+        views = snapshot.views
+        response = views.get(key)
+        if response is not None:
+            views.move_to_end(key)
+            return response
+        response = Response(self.table_page(number, filename, section, table, platforms, query, category,
+                                            offset, limit))
+        views[key] = response
+        if len(views) > VIEW_CACHE_SIZE:
+            views.popitem(last=False)
+        return response
+    
+    def resolve(self, target):
+        """Return the Response for a request target"""
+        snapshot = self.snapshot  # one snapshot for the whole request, even across a reload
+        parts = urlsplit(target)
+        path = parts.path.rstrip('/') or '/'
+        response = snapshot.responses.get(path)
+        if response is not None and (not parts.query or path in ('/', '/tables')):
+            return response
+        
+        segments = [unquote(s) for s in path.split('/')[1:]]
+        if len(segments) < 3 or segments[0] != 'tables':
+            return error_response(404, f"no such resource: {path}")
+        base = segments[1]
+        number = snapshot.aliases.get((base, segments[2]))
+        if number is None:
+            return error_response(404, f"no such table: {base}/{segments[2]}")
+        canonical = table_path(base, number)
+        rest = '/'.join(quote(s) for s in segments[3:])
+        if rest:
+            response = snapshot.responses.get(f"{canonical}/{rest}")
+            return response or error_response(404, f"no such resource: {path}")
+        if not parts.query:
+            return snapshot.responses[canonical]
+        return self.view(snapshot, base, number, parse_qs(parts.query))
+
+async def handle_connection(store, reader, writer):
+    """Serve HTTP/1.1 requests on one connection until it closes"""
+    try:
+        while True:
+            try:
+                request = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+            lines = request.decode('latin-1').split('\r\n')
+            try:
+                method, target, version = lines[0].split(' ')
+            except ValueError:
+                response = error_response(400, 'malformed request line')
+                writer.write(response.head + b'Connection: close\r\n\r\n' + response.body)
+                break
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(':')
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+            length = headers.get('content-length', '0')
+            if not (length.isascii() and length.isdigit()):
+                response = error_response(400, 'invalid Content-Length')
+                writer.write(response.head + b'Connection: close\r\n\r\n' + response.body)
+                break
+            if int(length):
+                try:
+                    await reader.readexactly(int(length))
+                except asyncio.IncompleteReadError:
+                    break
+            
+            connection = headers.get('connection', '').lower()
+            close = connection == 'close' or (version == 'HTTP/1.0' and connection != 'keep-alive')
+            trailer = b'Connection: close\r\n\r\n' if close else b'\r\n'
+            
+            if method not in ('GET', 'HEAD'):
+                response = error_response(405, f"method not allowed: {method}")
+                writer.write(response.head + b'Allow: GET, HEAD\r\n' + trailer + response.body)
+            else:
+                response = store.resolve(target)
+                if response.status == 200 and etag_matches(headers.get('if-none-match'), response.etag):
+                    writer.write(response.not_modified + trailer)
+                elif method == 'HEAD':
+                    writer.write(response.head + trailer)
+                else:
+                    writer.write(response.head + trailer + response.body)
+            await writer.drain()
+            if close:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def reload_on_change(store, interval):
+    """Poll the sources, build a new snapshot in a worker thread when one changes and swap it in here"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        if store.changed():
+            try:
+                snapshot = await loop.run_in_executor(None, store.build)
+                store.snapshot = snapshot
+                print(f"Reloaded {len(snapshot.tables)} tables")
+            except Exception as e:
+                print(f"Reload failed, still serving the previous data: {e}")
+
+async def serve(sources, host, port, interval):
+    store = ComparisonStore(sources)
+    count = store.load()
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(store, reader, writer),
+        host, port, limit=MAX_HEADER_BYTES
+    )
+    print(f"Serving {count} tables on http://{host}:{port}/tables (Ctrl+C to stop)")
+    reload_task = asyncio.create_task(reload_on_change(store, interval)) if interval > 0 else None
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if reload_task:
+            reload_task.cancel()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('sources', nargs='*', default=DEFAULT_SOURCES, help='markdown files to serve')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=8000, help='port to listen on')
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help='seconds between checks for changed sources (0 disables reloading)')
+    args = parser.parse_args()
+    sources = list(dict.fromkeys(os.path.normpath(f) for f in args.sources))
+    bases = list(source_bases(sources).values())
+    clashes = sorted({base for base in bases if bases.count(base) > 1})
+    if clashes:
+        parser.error(f"sources share a name in URLs: {', '.join(clashes)}")
+    try:
+        asyncio.run(serve(sources, args.host, args.port, args.interval))
+    except KeyboardInterrupt:
+        print("\nStopped serving")
+
+if __name__ == "__main__":
+    main()
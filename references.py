@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Resolve inline [Label][n] citations against a markdown References section
+"""
+
+import json
+import re
+
+from build_manifest import hash_bytes
+
+CITATION_PATTERN = re.compile(r'\[([^\[\]]+)\]\[(\d+)\]')
+REFERENCE_PATTERN = re.compile(r'^\[(\d+)\]:\s*(\S+)(?:\s+"(.*)")?\s*$')
+
+class ReferenceIndex:
+    """Numbered link definitions such as '[3]: https://... "Title"'.
+    
+    Definitions are fed in line by line with add_line(), so the index can be
+    filled during a pass over the markdown that is already reading it.
+    """
+    
+    __slots__ = ('links',)
+    
+    def __init__(self):
+        self.links = {}
+    
+    def add_line(self, line):
+        """Record the line if it is a reference definition; return True if it was"""
+        if not line.startswith('['):
+            return False
+        match = REFERENCE_PATTERN.match(line.strip())
+        if not match:
+            return False
+        number, url, title = match.groups()
+        self.links[int(number)] = (url, title or '')
+        return True
+    
+    def __len__(self):
+        return len(self.links)
+    
+    def get(self, number):
+        """Return (url, title) for a reference number, or None if undefined"""
+        return self.links.get(number)
+    
+    def digest(self):
+        """Return a content hash of the definitions, for build manifests"""
+        return hash_bytes(json.dumps(sorted(self.links.items())).encode('utf-8'))
+    
+    def resolve(self, cell):
+        """Return the citations of a cell as a list of link dicts"""
+        links = []
+        for label, number in iter_citations(cell):
+            url, title = self.links.get(number, (None, ''))
+            links.append({'label': label, 'number': number, 'url': url, 'title': title})
+        return links
+    
+    def split(self, cell):
+        """Split a cell into text and resolved link segments.
+        
+        Yields ('text', text) and ('link', label, url, title) tuples in order;
+        citations to undefined references stay in the text unchanged.
+        """
+        last = 0
+        for match in CITATION_PATTERN.finditer(cell):
+            link = self.links.get(int(match.group(2)))
+            if link is None:
+                continue
+            if match.start() > last:
+                yield 'text', cell[last:match.start()]
+            yield 'link', match.group(1), link[0], link[1]
+            last = match.end()
+        if last < len(cell):
+            yield 'text', cell[last:]
+    
+    def label_text(self, cell):
+        """Return the cell with resolvable citations shortened to 'Label [n]'"""
+        if '][' not in cell:
+            return cell
+        
+        def shorten(match):
+            if int(match.group(2)) not in self.links:
+                return match.group(0)
+            return f"{match.group(1)} [{match.group(2)}]"
+        
+        return CITATION_PATTERN.sub(shorten, cell)
+    
+    def as_dict(self):
+        return {str(n): {'url': url, 'title': title} for n, (url, title) in sorted(self.links.items())}
+
+def iter_citations(cell):
+    """Yield (label, number) for every [Label][n] citation in a cell"""
+    if '][' not in cell:
+        return
+    for match in CITATION_PATTERN.finditer(cell):
+        yield match.group(1), int(match.group(2))
+
+def read_references(filename):
+    """Build the ReferenceIndex of a markdown file"""
+    references = ReferenceIndex()
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            references.add_line(line)
+    return references
+
+def create_references_json(references, tables, filename):
+    """Write the reference index and every resolved cell citation to JSON.
+    
+    tables yields (number, ComparisonTable) pairs. Each citation entry names
+    the table, the 0-based data row and the column header of its cell, so
+    consumers can use the links without scanning cells themselves.
+    """
+    citations = []
+    for number, table in tables:
+        for header, column in zip(table.headers, table.columns):
+            # Resolve each distinct value once, then point every row at it
+            resolved = [references.resolve(value) for value in column.values]
+            for row, code in enumerate(column.codes):
+                if resolved[code]:
+                    citations.append({'table': number, 'row': row, 'column': header, 'links': resolved[code]})
+    
+    with open(filename, 'w', encoding='utf-8') as jsonfile:
+        json.dump({'references': references.as_dict(), 'citations': citations}, jsonfile, indent=2, ensure_ascii=False)
+    
+    print(f"Created references: {filename}")
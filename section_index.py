@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Index the sections of a markdown file by byte range for random access to one section
+"""
+
+import argparse
+import hashlib
+import json
+import re
+
+# Section kinds, from what the section's own lines (before any subheading) hold
+SECTION_TABLE = 'table'
+SECTION_PLATFORM_LIST = 'platform_list'
+SECTION_REFERENCES = 'references'
+SECTION_TEXT = 'text'
+
+HEADING_PATTERN = re.compile(rb'^(#{1,6})\s+(.*?)\s*#*\s*$')
+PLATFORM_ITEM = re.compile(r'^\s*(\d+)\.\s+\*\*(.+?)\*\*\s*(?:[-–—:]\s*(.*?))?\s*$')
+REFERENCE_LINE = re.compile(rb'^\[\d+\]:\s*\S')
+
+def slugify(title):
+    """Return a file-name friendly form of a heading: 'UI/UX Features' -> 'ui_ux_features'"""
+    return re.sub(r'[^a-z0-9]+', '_', title.lower()).strip('_') or 'section'
+
+def is_table_bytes(line):
+    """Return True if a raw line belongs to a markdown pipe table (as is_table_line)"""
+    return line.strip().startswith(b'|')
+
+def parse_platform_item(line):
+    """Return {'number', 'name', 'description'} for a '1. **Name** - text' line, or None"""
+    match = PLATFORM_ITEM.match(line)
+    if not match:
+        return None
+    number, name, description = match.groups()
+    return {'number': int(number), 'name': name.strip(), 'description': description or ''}
+
+class Section:
+    """One heading and the byte range of its content.
+    
+    start..end covers the heading and everything up to the next heading of
+    the same or a higher level, so a section includes its subsections;
+    body_start..body_end is the section's own content before any
+    subheading. tables holds the positional numbers of the pipe tables in
+    the body, as used by the _table_N outputs.
+    """
+    
+    __slots__ = ('level', 'title', 'slug', 'kind', 'parent', 'start', 'body_start', 'body_end', 'end',
+                 'tables', 'digest')
+    
+    def __init__(self, level, title, slug, parent, start, body_start):
+        self.level = level
+        self.title = title
+        self.slug = slug
+        self.kind = SECTION_TEXT
+        self.parent = parent
+        self.start = start
+        self.body_start = body_start
+        self.body_end = None
+        self.end = None
+        self.tables = []
+        self.digest = None
+    
+    def as_dict(self):
+        return {
+            'title': self.title,
+            'slug': self.slug,
+            'level': self.level,
+            'kind': self.kind,
+            'parent': self.parent.slug if self.parent else None,
+            'start': self.start,
+            'end': self.end,
+            'tables': self.tables
+        }
+
+class SectionIndex:
+    """Sections of a markdown file, found in one pass over its bytes.
+    
+    The pass records each heading's byte range and kind, a content hash of
+    every section body, and a hash of every table block numbered exactly
+    as hash_markdown_tables numbers them. Nothing is parsed; a caller
+    seeks to the one section it needs and reads only those bytes. If a
+    ReferenceIndex is given, the reference definitions are collected in
+    the same pass.
+    """
+    
+    def __init__(self, filename, references=None):
+        self.filename = filename
+        self.sections = []
+        self.table_hashes = []
+        self._build(references)
+    
+    def _build(self, references):
+        open_sections = []
+        current = None
+        body = None
+        counts = None
+        table_digest = None
+        in_fence = False
+        pos = 0
+        
+        def close_body(end):
+            if current is not None:
+                current.body_end = end
+                current.digest = body.hexdigest()
+                if counts['table']:
+                    current.kind = SECTION_TABLE
+                elif counts['reference']:
+                    current.kind = SECTION_REFERENCES
+                elif counts['platform']:
+                    current.kind = SECTION_PLATFORM_LIST
+        
+        with open(self.filename, 'rb') as f:
+            for line in f:
+                start = pos
+                pos += len(line)
+                
+                # Table blocks are hashed as text-mode reads see them
+                if is_table_bytes(line):
+                    if table_digest is None:
+                        table_digest = hashlib.sha256()
+                        if current is not None:
+                            current.tables.append(len(self.table_hashes) + 1)
+                    table_digest.update(line.replace(b'\r\n', b'\n').replace(b'\r', b'\n'))
+                elif table_digest is not None:
+                    self.table_hashes.append(table_digest.hexdigest())
+                    table_digest = None
+                
+                if line.lstrip().startswith(b'```'):
+                    in_fence = not in_fence
+                heading = None if in_fence or not line.startswith(b'#') else HEADING_PATTERN.match(line.rstrip(b'\r\n'))
+                if heading:
+                    close_body(start)
+                    level = len(heading.group(1))
+                    while open_sections and open_sections[-1].level >= level:
+                        open_sections.pop().end = start
+                    title = heading.group(2).decode('utf-8')
+                    current = Section(level, title, self._unique_slug(slugify(title)),
+                                      open_sections[-1] if open_sections else None, start, pos)
+                    self.sections.append(current)
+                    open_sections.append(current)
+                    body = hashlib.sha256()
+                    counts = {'table': 0, 'reference': 0, 'platform': 0}
+                    continue
+                
+                if references is not None:
+                    references.add_line(line.decode('utf-8'))
+                if current is None:
+                    continue
+                body.update(line)
+                if is_table_bytes(line):
+                    counts['table'] += 1
+                elif REFERENCE_LINE.match(line):
+                    counts['reference'] += 1
+                elif line[:1].isdigit() and parse_platform_item(line.decode('utf-8')):
+                    counts['platform'] += 1
+        
+        if table_digest is not None:
+            self.table_hashes.append(table_digest.hexdigest())
+        close_body(pos)
+        for section in open_sections:
+            section.end = pos
+    
+    def _unique_slug(self, slug):
+        used = {s.slug for s in self.sections}
+        if slug not in used:
+            return slug
+        n = 2
+        while f"{slug}_{n}" in used:
+            n += 1
+        return f"{slug}_{n}"
+    
+    def __len__(self):
+        return len(self.sections)
+    
+    def __iter__(self):
+        return iter(self.sections)
+    
+    def find(self, name):
+        """Return the section with this title or slug, or None"""
+        for section in self.sections:
+            if name in (section.title, section.slug):
+                return section
+        return None
+    
+    def of_kind(self, kind):
+        return [s for s in self.sections if s.kind == kind]
+    
+    def children(self, section):
+        return [s for s in self.sections if s.parent is section]
+    
+    def read(self, section, body_only=False):
+        """Return the text of one section, reading only its bytes"""
+        start, end = (section.body_start, section.body_end) if body_only else (section.start, section.end)
+        with open(self.filename, 'rb') as f:
+            f.seek(start)
+            return f.read(end - start).decode('utf-8')
+    
+    def iter_lines(self, section, body_only=True):
+        """Yield the lines of one section as text-mode reads would return them"""
+        yield from self.read(section, body_only).replace('\r\n', '\n').replace('\r', '\n').splitlines(keepends=True)
+    
+    def platform_list(self, section):
+        """Return the numbered platform list of a section as a list of dicts"""
+        items = []
+        for line in self.iter_lines(section):
+            item = parse_platform_item(line)
+            if item:
+                items.append(item)
+        return items
+    
+    def platform_lists(self, parent_title=None):
+        """Return {section title: items} for every platform list, optionally under one heading"""
+        parent = self.find(parent_title) if parent_title else None
+        lists = {}
+        for section in self.of_kind(SECTION_PLATFORM_LIST):
+            if parent_title is None or section is parent or section.parent is parent:
+                lists[section.title] = self.platform_list(section)
+        return lists
+    
+    def digests(self):
+        """Return {slug: body hash}, for spotting which sections changed"""
+        return {section.slug: section.digest for section in self.sections}
+    
+    def table_section(self, number):
+        """Return the section holding the table numbered number, or None"""
+        for section in self.sections:
+            if number in section.tables:
+                return section
+        return None
+    
+    def as_dict(self):
+        return {'source': self.filename, 'sections': [s.as_dict() for s in self.sections]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('markdown', help='markdown file to index')
+    parser.add_argument('--section', metavar='NAME', help='print one section (title or slug) instead of the index')
+    parser.add_argument('--json', action='store_true', help='print JSON; platform lists are printed as structured items')
+    args = parser.parse_args()
+    
+    index = SectionIndex(args.markdown)
+    if args.section:
+        section = index.find(args.section)
+        if section is None:
+            print(f"Section not found: {args.section}")
+            raise SystemExit(1)
+        if args.json and section.kind == SECTION_PLATFORM_LIST:
+            print(json.dumps(index.platform_list(section), indent=2, ensure_ascii=False))
+        else:
+            print(index.read(section), end='')
+        return
+    
+    if args.json:
+        print(json.dumps(index.as_dict(), indent=2, ensure_ascii=False))
+        return
+    print(f"{'Bytes':>15}  {'Kind':<14}Section")
+    for section in index:
+        indent = '  ' * (section.level - 1)
+        tables = f"  (table {', '.join(map(str, section.tables))})" if section.tables else ''
+        print(f"{section.start:>7}-{section.end:<7}  {section.kind:<14}{indent}{section.title} [{section.slug}]{tables}")
+
+if __name__ == "__main__":
+    main()
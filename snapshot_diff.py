@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Stream cell-level differences between dated snapshots of a comparison table
+"""
+
+import argparse
+import csv
+import itertools
+import json
+from pathlib import Path
+
+from build_manifest import hash_file
+from comparison_table import KEY_HEADERS, REMARK_PREFIX
+from generate_excel import create_csv_from_table
+from generate_simple_pdf import create_html_from_csv, create_html_from_data
+
+CHANGE_HEADERS = ['Category', 'Ser', 'Topic Name', 'Platform', 'Change', 'Old Value', 'New Value',
+                  'Old Snapshot', 'New Snapshot']
+
+def iter_json_objects(filename, chunk_size=1 << 16):
+    """Yield the row objects of a JSON array or JSON Lines file one at a time.
+    
+    The file is read in chunks and decoded object by object, so only the
+    row being decoded is held in memory rather than the whole array.
+    """
+    decoder = json.JSONDecoder()
+    with open(filename, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        eof = False
+        while True:
+            # Skip the array brackets, separators and whitespace between rows
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n[],':
+                pos += 1
+            if pos == len(buffer):
+                buffer = f.read(chunk_size)
+                pos = 0
+                if not buffer:
+                    return
+                continue
+            try:
+                row, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            yield row
+            pos = end
+
+def iter_snapshot_rows(filename):
+    """Yield the rows of a CSV, JSON or JSON Lines snapshot as dicts"""
+    if Path(filename).suffix == '.csv':
+        with open(filename, 'r', encoding='utf-8', newline='') as csvfile:
+            yield from csv.DictReader(csvfile)
+    else:
+        yield from iter_json_objects(filename)
+
+def row_key(row):
+    """Return the (Category, Ser, Topic Name) key that identifies a feature row"""
+    return tuple(row.get(h, '') for h in KEY_HEADERS)
+
+def row_platforms(row):
+    """Return the platform headers of a row, in order"""
+    return [h for h in row if h not in KEY_HEADERS and not h.startswith(REMARK_PREFIX)]
+
+def diff_row(key, old, new):
+    """Yield (key, platform, change, old value, new value) for the cells that differ"""
+    platforms = row_platforms(old)
+    platforms += [p for p in row_platforms(new) if p not in old]
+    for platform in platforms:
+        old_value = old.get(platform)
+        new_value = new.get(platform)
+        if old_value == new_value:
+            continue
+        if old_value is None:
+            yield key, platform, 'added', '', new_value
+        elif new_value is None:
+            yield key, platform, 'removed', old_value, ''
+        else:
+            yield key, platform, 'changed', old_value, new_value
+
+def take_pending(pending, key):
+    """Remove and return the oldest row waiting under key"""
+    rows = pending[key]
+    row = rows.pop(0)
+    if not rows:
+        del pending[key]
+    return row
+
+def diff_snapshots(old_filename, new_filename):
+    """Yield (key, platform, change, old value, new value) between two snapshots.
+    
+    Both snapshots are streamed side by side. Rows whose keys line up are
+    compared at once; a row without a partner waits in a pending table
+    until its key turns up in the other snapshot. Snapshots are normally
+    in the same order, so memory stays bounded by how far rows moved
+    rather than by the size of the table. Rows still pending at the end
+    were removed or added. Rows sharing a key are paired in the order
+    they appear, so a repeated key never hides a row.
+    """
+    pending_old = {}
+    pending_new = {}
+    old_rows = iter_snapshot_rows(old_filename)
+    new_rows = iter_snapshot_rows(new_filename)
+    
+    while True:
+        old = next(old_rows, None)
+        new = next(new_rows, None)
+        if old is None and new is None:
+            break
+        
+        if old is not None and new is not None and row_key(old) == row_key(new) \
+                and row_key(old) not in pending_old and row_key(new) not in pending_new:
+            yield from diff_row(row_key(old), old, new)
+            continue
+        
+        if old is not None:
+            key = row_key(old)
+            if key in pending_new:
+                yield from diff_row(key, old, take_pending(pending_new, key))
+            else:
+                pending_old.setdefault(key, []).append(old)
+        if new is not None:
+            key = row_key(new)
+            if key in pending_old:
+                yield from diff_row(key, take_pending(pending_old, key), new)
+            else:
+                pending_new.setdefault(key, []).append(new)
+    
+    for key, rows in pending_old.items():
+        for old in rows:
+            for platform in row_platforms(old):
+                yield key, platform, 'removed', old[platform], ''
+    for key, rows in pending_new.items():
+        for new in rows:
+            for platform in row_platforms(new):
+                yield key, platform, 'added', '', new[platform]
+
+def iter_changes(snapshots, counts=None):
+    """Yield change report rows for each consecutive pair of snapshots.
+    
+    Byte-identical neighbours are skipped without being parsed. If counts
+    is a dict, it is updated with the number of cells per kind of change.
+    """
+    previous = None
+    previous_hash = None
+    for snapshot in snapshots:
+        snapshot_hash = hash_file(snapshot)
+        if previous is not None and snapshot_hash != previous_hash:
+            for key, platform, change, old_value, new_value in diff_snapshots(previous, snapshot):
+                if counts is not None:
+                    counts[change] = counts.get(change, 0) + 1
+                yield list(key) + [platform, change, old_value, new_value, str(previous), str(snapshot)]
+        previous = snapshot
+        previous_hash = snapshot_hash
+
+def create_change_report(snapshots, csv_filename=None, html_filename=None, title="Comparison Changes"):
+    """Write the changes across snapshots as CSV and/or HTML and return the counts.
+    
+    With both outputs the changes are streamed to the CSV once and the HTML
+    is rendered from it, so the snapshots are only diffed a single time.
+    """
+    counts = {}
+    changes = iter_changes(snapshots, counts)
+    if csv_filename:
+        create_csv_from_table({'headers': CHANGE_HEADERS, 'data': changes}, csv_filename)
+        if html_filename:
+            create_html_from_csv(csv_filename, html_filename, title)
+    elif html_filename:
+        create_html_from_data(itertools.chain([CHANGE_HEADERS], changes), html_filename, title)
+    else:
+        for category, ser, topic_name, platform, change, old_value, new_value, _, new_snapshot in changes:
+            print(f"{new_snapshot}: {change:<8} [{ser}] {topic_name} | {platform}: {old_value!r} -> {new_value!r}")
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('snapshots', nargs='+',
+                        help='CSV, JSON or JSON Lines snapshots of one table, oldest first')
+    parser.add_argument('--csv', help='write the change report to this CSV file')
+    parser.add_argument('--html', help='write the change report to this HTML file')
+    parser.add_argument('--title', default='Comparison Changes', help='title of the HTML report')
+    args = parser.parse_args()
+    
+    missing = [s for s in args.snapshots if not Path(s).exists()]
+    if missing:
+        print(f"Snapshot not found: {', '.join(missing)}")
+        raise SystemExit(1)
+    
+    counts = create_change_report(args.snapshots, args.csv, args.html, args.title)
+    summary = ', '.join(f"{counts.get(change, 0)} {change}" for change in ('added', 'removed', 'changed'))
+    print(f"Compared {len(args.snapshots)} snapshots: {summary}")
+
+if __name__ == "__main__":
+    main()
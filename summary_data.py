@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Aggregate the comparison tables once for the summary CSV, HTML and PDF
+"""
+
+import json
+from pathlib import Path
+
+from build_manifest import hash_bytes, hash_file
+from comparison_table import KEY_HEADERS, REMARK_PREFIX
+from csv_source import open_csv_source
+from section_index import SectionIndex
+
+# (table CSV, table JSON, output stem, label) of every table in the summary
+SUMMARY_TABLES = [
+    ("video_platform_comparison_table_1.csv", "video_platform_comparison_table_1.json",
+     "technical_comparison", "Technical Settings"),
+    ("video_platform_comparison_table_2.csv", "video_platform_comparison_table_2.json",
+     "uiux_comparison", "UI/UX Features"),
+    ("video_platform_comparison_practical_table_1.csv", "video_platform_comparison_practical_table_1.json",
+     "technical_comparison_practical", "Technical Settings (Practical)"),
+    ("video_platform_comparison_practical_table_2.csv", "video_platform_comparison_practical_table_2.json",
+     "uiux_comparison_practical", "UI/UX Features (Practical)")
+]
+
+# Markdown sources whose numbered platform lists name the additional platforms
+MARKDOWN_SOURCES = ["video_platform_comparison.md", "video_platform_comparison_practical.md"]
+ADDITIONAL_SECTION = "Additional Promising Platforms"
+
+# Outputs that do not belong to a single table
+WORKBOOK_OUTPUTS = [
+    ('XLSX', "video_platform_comparison.xlsx", 'All tables, one sheet per table')
+]
+
+# Display label and description of each 'Category' value
+CATEGORY_NOTES = {
+    'Technical Setting': ('Technical Settings', 'Backend languages, codecs, encryption, etc.'),
+    'UI/UX Features': ('UI/UX Features', 'User interface and experience features')
+}
+
+# Type and key features of each compared platform; these are not in the tables
+PLATFORM_NOTES = {
+    'Jitsi Meet': ('Open Source', 'Self-hosted, WebRTC, Free'),
+    'Google Meet': ('Enterprise', 'Google Workspace integration'),
+    'Zoom': ('Commercial', 'Wide adoption, extensive features'),
+    'Microsoft Teams': ('Enterprise', 'Microsoft 365 integration'),
+    'Cisco Webex': ('Enterprise', 'Cisco ecosystem integration'),
+    'Discord': ('Community', 'Gaming and community focus'),
+    'Slack': ('Business', 'Team collaboration focus'),
+    'BlueJeans': ('Enterprise', 'Verizon enterprise platform'),
+    'RingCentral': ('Business', 'Unified communications'),
+    '8x8': ('Business', 'Cloud communications'),
+    'Whereby': ('Simple', 'Browser-based, easy to use'),
+    'Loom': ('Recording', 'Video messaging and screen recording')
+}
+
+def file_description(label, detail):
+    """Add a detail to a table label: 'UI/UX Features (Practical)' -> 'UI/UX Features (Practical, JSON format)'"""
+    if label.endswith(')'):
+        return f"{label[:-1]}, {detail})"
+    return f"{label} ({detail})"
+
+def table_outputs(csv_file, json_file, stem, label):
+    """Return (file type, filename, description) for every output of one table"""
+    return [
+        ('CSV', csv_file, label),
+        ('HTML', f"{stem}.html", file_description(label, 'Printable')),
+        ('JSON', json_file, file_description(label, 'JSON format')),
+        ('Formatted CSV', f"{stem}_formatted.csv", file_description(label, 'Formatted')),
+        ('PDF', f"{stem}.pdf", file_description(label, 'PDF'))
+    ]
+
+def read_additional_platforms(markdown_files):
+    """Return the platforms listed under the additional-platforms section, in order"""
+    platforms = {}
+    for filename in markdown_files:
+        if not Path(filename).exists():
+            continue
+        for items in SectionIndex(filename).platform_lists(ADDITIONAL_SECTION).values():
+            for item in items:
+                platforms.setdefault(item['name'], None)
+    return list(platforms)
+
+class SummaryData:
+    """Aggregates shown by every summary output.
+    
+    categories holds (label, feature count, description) per category,
+    tables holds (label, csv file, rows, platform count) per table, files
+    holds (file type, filename, description) for each output on disk.
+    """
+    
+    def __init__(self, categories, tables, platforms, additional_platforms, files):
+        self.categories = categories
+        self.tables = tables
+        self.platforms = platforms
+        self.additional_platforms = additional_platforms
+        self.files = files
+    
+    def files_of_type(self, file_type):
+        return [(filename, description) for kind, filename, description in self.files if kind == file_type]
+    
+    def file_types(self):
+        return list(dict.fromkeys(kind for kind, _, _ in self.files))
+    
+    def platform_notes(self, platform):
+        return PLATFORM_NOTES.get(platform, ('', ''))
+    
+    def as_dict(self):
+        return {
+            'categories': self.categories,
+            'tables': self.tables,
+            'platforms': self.platforms,
+            'additional_platforms': self.additional_platforms,
+            'files': self.files
+        }
+    
+    def digest(self):
+        """Return a hash of the aggregates, used as a manifest input of the summaries"""
+        return hash_bytes(json.dumps(self.as_dict(), ensure_ascii=False).encode('utf-8'))
+
+def aggregate_tables(summary_tables=SUMMARY_TABLES, markdown_files=MARKDOWN_SOURCES):
+    """Compute every summary aggregate in a single pass over the table CSVs.
+    
+    The feature count of a category is its row count in the table that
+    covers it most fully, since the regular and practical tables describe
+    the same features with different wording. Platforms come from the
+    table headers in first-seen order.
+    """
+    features = {}
+    platforms = {}
+    tables = []
+    files = []
+    for csv_file, json_file, stem, label in summary_tables:
+        if not Path(csv_file).exists():
+            continue
+        with open_csv_source(csv_file) as source:
+            headers = source.headers
+            positions = {header: i for i, header in enumerate(headers)}
+            table_platforms = [h for h in headers if h not in KEY_HEADERS and not h.startswith(REMARK_PREFIX)]
+            for platform in table_platforms:
+                platforms.setdefault(platform, None)
+            counts = {}
+            for row in source.iter_rows():
+                category = row[positions['Category']] if 'Category' in positions else ''
+                counts[category] = counts.get(category, 0) + 1
+        for category, count in counts.items():
+            features[category] = max(features.get(category, 0), count)
+        rows = sum(counts.values())
+        tables.append((label, csv_file, rows, len(table_platforms)))
+        files.extend(table_outputs(csv_file, json_file, stem, label))
+    files.extend(WORKBOOK_OUTPUTS)
+    
+    categories = []
+    for category, count in features.items():
+        label, description = CATEGORY_NOTES.get(category, (category, ''))
+        categories.append((label, count, description))
+    additional = [p for p in read_additional_platforms(markdown_files) if p not in platforms]
+    
+    # Only list what was actually written, grouped by file type
+    kinds = list(dict.fromkeys(kind for kind, _, _ in files))
+    files = [f for kind in kinds for f in files if f[0] == kind and Path(f[1]).exists()]
+    return SummaryData(categories, tables, list(platforms), additional, files)
+
+_summary_cache = {}
+
+def load_summary():
+    """Return the SummaryData for the current files, computing it at most once per change.
+    
+    The cache key is the content of the tables and markdown sources plus
+    the set of outputs on disk, so the CSV, HTML and PDF summaries written
+    in one run share a single aggregation pass.
+    """
+    names = [t[0] for t in SUMMARY_TABLES] + MARKDOWN_SOURCES
+    outputs = [f[1] for t in SUMMARY_TABLES for f in table_outputs(*t)] + [f[1] for f in WORKBOOK_OUTPUTS]
+    key = (tuple(hash_file(f) for f in names), tuple(Path(f).exists() for f in outputs))
+    if key not in _summary_cache:
+        _summary_cache.clear()
+        _summary_cache[key] = aggregate_tables()
+    return _summary_cache[key]
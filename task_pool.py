@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Run independent rendering tasks across a process pool
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+from profiling import PROFILER
+
+def default_jobs():
+    """Return the number of CPUs available to this process"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def _call(func, args):
+    """Run one task and return (error, result), turning an exception into a printable message"""
+    try:
+        return None, func(*args)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}", None
+
+def _call_in_worker(func, args, profile):
+    """Run one task in a pool worker and ship back its printed output and profiling records"""
+    if profile:
+        PROFILER.enable()
+        PROFILER.take_records()  # drop anything inherited from the parent
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        error, result = _call(func, args)
+    return error, result, PROFILER.take_records() if profile else [], output.getvalue()
+
+def run_tasks(tasks, jobs=1, results=None):
+    """Run (func, args) tasks and return their errors in task order.
+    
+    With jobs <= 1 the tasks run one after another in this process. Otherwise
+    they are spread over a process pool; results are still collected in
+    submission order, so reporting is deterministic. A failing task never
+    stops the others: its entry in the returned list holds the error text,
+    and successful tasks hold None. If results is a list, the return value
+    of each task (None on failure) is appended to it in task order.
+    What a worker prints is captured and printed here in task order, so the
+    messages of parallel tasks never interleave. Profiling records from
+    workers are merged into the parent's profiler.
+    """
+    tasks = list(tasks)
+    if results is None:
+        results = []
+    errors = []
+    if jobs <= 1 or len(tasks) <= 1:
+        for func, args in tasks:
+            error, result = _call(func, args)
+            errors.append(error)
+            results.append(result)
+        return errors
+    
+    # Imported here so single-task and no-op runs skip its startup cost
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+        futures = [pool.submit(_call_in_worker, func, args, PROFILER.enabled) for func, args in tasks]
+        for future in futures:
+            try:
+                error, result, records, output = future.result()
+                PROFILER.add_records(records)
+            except Exception as e:
+                # The worker itself died (e.g. killed or unpicklable arguments)
+                error, result, output = f"{type(e).__name__}: {e}", None, ''
+            sys.stdout.write(output)
+            errors.append(error)
+            results.append(result)
+    return errors
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Streaming XLSX workbook writer built on the standard library
+"""
+
+import itertools
+import re
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+# Fixed timestamp so identical workbooks are byte-identical
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+MAX_SHEET_NAME = 31
+COLUMN_WIDTH = 18
+INVALID_SHEET_CHARS = re.compile(r'[\[\]:*?/\\]')
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+CONTENT_TYPES_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+)
+CONTENT_TYPES_SHEET = (
+    '<Override PartName="/xl/worksheets/sheet{n}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+
+ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+WORKBOOK_RELS_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+)
+WORKBOOK_RELS_SHEET = (
+    '<Relationship Id="rId{n}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet{n}.xml"/>'
+)
+WORKBOOK_RELS_TAIL = (
+    '<Relationship Id="rId{styles}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '<Relationship Id="rId{strings}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" '
+    'Target="sharedStrings.xml"/>'
+    '</Relationships>'
+)
+
+# Style 0 is the default; style 1 is the bold, shaded header row
+STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="3"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFF2F2F2"/><bgColor indexed="64"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheetViews><sheetView workbookViewId="0"{selected}>'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '<selection pane="bottomLeft" activeCell="A2" sqref="A2"/>'
+    '</sheetView></sheetViews>'
+    '<sheetFormatPr defaultRowHeight="15"/>'
+    '{cols}<sheetData>'
+)
+
+def column_letter(index):
+    """Return the spreadsheet column name (A, B, ..., AA) of a 0-based index"""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def sheet_name(title, used):
+    """Return a valid, unique sheet name (at most 31 characters) for a title"""
+    name = INVALID_SHEET_CHARS.sub(' ', title).strip("' ") or 'Sheet'
+    name = name[:MAX_SHEET_NAME]
+    candidate = name
+    n = 2
+    while candidate.lower() in used:
+        suffix = f" ({n})"
+        candidate = name[:MAX_SHEET_NAME - len(suffix)] + suffix
+        n += 1
+    used.add(candidate.lower())
+    return candidate
+
+class XLSXWriter:
+    """Write an .xlsx workbook one sheet and one row at a time.
+    
+    Each sheet's XML is streamed straight into its zip entry, so memory use
+    does not grow with the number of rows. Strings go to a shared-strings
+    table that stores each distinct value once; cells that are plain
+    integers (such as 'Ser') are written as numbers. Every sheet gets a
+    frozen, bold header row and an autofilter over its columns.
+    """
+    
+    def __init__(self, filename):
+        self.filename = filename
+        self._zip = zipfile.ZipFile(filename, 'w', zipfile.ZIP_DEFLATED)
+        self._sheets = []  # (name, last column letter, last row number)
+        self._used_names = set()
+        self._strings = {}
+        self._string_count = 0
+    
+    def _write_entry(self, name, text):
+        info = zipfile.ZipInfo(name, ZIP_DATE_TIME)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        self._zip.writestr(info, text)
+    
+    def _string_index(self, value):
+        self._string_count += 1
+        index = self._strings.get(value)
+        if index is None:
+            index = len(self._strings)
+            self._strings[value] = index
+        return index
+    
+    def _cell(self, ref, value, style):
+        if value == '':
+            return f'<c r="{ref}"{style}/>' if style else ''
+        if value.isascii() and value.isdigit() and len(value) < 16 and (value == '0' or value[0] != '0'):
+            return f'<c r="{ref}"{style}><v>{value}</v></c>'
+        return f'<c r="{ref}"{style} t="s"><v>{self._string_index(value)}</v></c>'
+    
+    def add_sheet(self, title, data):
+        """Add a sheet from an iterable of rows whose first row is the header"""
+        rows = iter(data)
+        headers = next(rows, None)
+        rows = itertools.chain([headers], rows) if headers is not None else []
+        headers = headers or []
+        name = sheet_name(title, self._used_names)
+        number = len(self._sheets) + 1
+        columns = [column_letter(j) for j in range(max(len(headers), 1))]
+        cols = f'<cols><col min="1" max="{len(columns)}" width="{COLUMN_WIDTH}" customWidth="1"/></cols>'
+        
+        info = zipfile.ZipInfo(f"xl/worksheets/sheet{number}.xml", ZIP_DATE_TIME)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        with self._zip.open(info, 'w') as sheet:
+            selected = ' tabSelected="1"' if number == 1 else ''
+            sheet.write(SHEET_HEAD.format(selected=selected, cols=cols).encode('utf-8'))
+            row_number = 0
+            for row_number, row in enumerate(rows, 1):
+                if len(row) > len(columns):
+                    columns.extend(column_letter(j) for j in range(len(columns), len(row)))
+                style = ' s="1"' if row_number == 1 else ''
+                cells = ''.join(self._cell(f"{columns[j]}{row_number}", value, style) for j, value in enumerate(row))
+                sheet.write(f'<row r="{row_number}">{cells}</row>'.encode('utf-8'))
+            last_column = columns[max(len(headers), 1) - 1]
+            sheet.write('</sheetData>'.encode('utf-8'))
+            if row_number:
+                sheet.write(f'<autoFilter ref="A1:{last_column}{row_number}"/>'.encode('utf-8'))
+            sheet.write('<pageMargins left="0.7" right="0.7" top="0.75" bottom="0.75" header="0.3" footer="0.3"/>'
+                        '</worksheet>'.encode('utf-8'))
+        
+        self._sheets.append((name, last_column, row_number))
+        return row_number
+    
+    def close(self):
+        """Write the shared strings, styles and workbook parts and finish the file"""
+        sheet_count = len(self._sheets)
+        if not sheet_count:
+            self.add_sheet('Sheet1', [])
+            sheet_count = 1
+        
+        strings = ''.join(
+            f'<si><t xml:space="preserve">{escape(INVALID_XML_CHARS.sub("", s))}</t></si>' for s in self._strings
+        )
+        self._write_entry('xl/sharedStrings.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            f'count="{self._string_count}" uniqueCount="{len(self._strings)}">{strings}</sst>'
+        ))
+        self._write_entry('xl/styles.xml', STYLES)
+        
+        sheets = ''.join(
+            f'<sheet name={quoteattr(name)} sheetId="{n}" r:id="rId{n}"/>'
+            for n, (name, _, _) in enumerate(self._sheets, 1)
+        )
+        filters = ''.join(
+            f'<definedName name="_xlnm._FilterDatabase" localSheetId="{n}" hidden="1">'
+            f"{escape(quoted_sheet_name(name))}!$A$1:${last_column}${rows}</definedName>"
+            for n, (name, last_column, rows) in enumerate(self._sheets) if rows
+        )
+        self._write_entry('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<bookViews><workbookView activeTab="0"/></bookViews><sheets>{sheets}</sheets>'
+            + (f'<definedNames>{filters}</definedNames>' if filters else '')
+            + '</workbook>'
+        ))
+        self._write_entry('xl/_rels/workbook.xml.rels', (
+            WORKBOOK_RELS_HEAD
+            + ''.join(WORKBOOK_RELS_SHEET.format(n=n) for n in range(1, sheet_count + 1))
+            + WORKBOOK_RELS_TAIL.format(styles=sheet_count + 1, strings=sheet_count + 2)
+        ))
+        self._write_entry('_rels/.rels', ROOT_RELS)
+        self._write_entry('[Content_Types].xml', (
+            CONTENT_TYPES_HEAD
+            + ''.join(CONTENT_TYPES_SHEET.format(n=n) for n in range(1, sheet_count + 1))
+            + '</Types>'
+        ))
+        self._zip.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def quoted_sheet_name(name):
+    """Quote a sheet name for use in a cell reference"""
+    return "'" + name.replace("'", "''") + "'"
+
+def create_xlsx_from_tables(tables, xlsx_filename):
+    """Write (title, rows) pairs as the sheets of one workbook; rows start with the header"""
+    with XLSXWriter(xlsx_filename) as workbook:
+        for title, data in tables:
+            workbook.add_sheet(title, data)
+    print(f"Created XLSX: {xlsx_filename}")